@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
-import os, sys
+import os, sys, tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -108,10 +108,61 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Schreibende Transaktionen sperren sofort, damit gleichzeitige Anfragen auf die
+        # Sperre warten, statt beim Wechsel von Lesen zu Schreiben abzubrechen.
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Der Angebotscache muss von allen Workern geteilt werden, sonst invalidiert eine Änderung
+    # nur den Cache des Workers, der sie verarbeitet hat. Bei mehreren Hosts auf einen
+    # gemeinsamen Server (z. B. `django.core.cache.backends.redis.RedisCache`) umstellen.
+    'offers': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'coderr-offers-cache'),
+    },
+}
+
+# In Tests wird nicht gecacht, damit sich Testfälle nicht gegenseitig beeinflussen.
+if TESTING:
+    for alias in CACHES:
+        CACHES[alias] = {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        }
+
+# Cache für anonyme Abfragen des Angebotskatalogs (`/api/offers/`). Prozesslokale Backends
+# (`LocMemCache`) werden nicht verwendet, der Katalog wird dann nicht gecacht.
+OFFERS_CACHE_ALIAS = 'offers'
+OFFERS_CACHE_TIMEOUT = 300
+
+
+# Abgeschlossene oder stornierte Bestellungen, die länger als diese Anzahl Tage nicht geändert
+# wurden, verschiebt `python manage.py archive_orders` nach `OrdersArchive`.
+ORDERS_ARCHIVE_AFTER_DAYS = 180
+
+# Gültigkeit (Sekunden) der einmal verwendbaren Tickets für den Ereignis-Stream `/api/order-events/`.
+ORDER_EVENTS_TICKET_TTL = 60
+
+
+# Fehlende Kennzahlen (Plattformstatistik, Bestellzähler) berechnet jeweils nur ein Worker neu;
+# die übrigen warten höchstens `SINGLE_FLIGHT_TIMEOUT` Sekunden. Prozessübergreifend wird über
+# Sperrdateien in `SINGLE_FLIGHT_LOCK_DIR` synchronisiert.
+SINGLE_FLIGHT_TIMEOUT = 5
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+SINGLE_FLIGHT_LOCK_DIR = os.path.join(tempfile.gettempdir(), 'coderr-single-flight')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -156,7 +207,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'coderr_auth_app.api.authentication.ProfileTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -0,0 +1,177 @@
+import json
+from django.db import DatabaseError, transaction
+from collections import Counter
+from django.utils import timezone
+from coderr_app.models import Offers, OfferDetails, Orders, OrderStatusCounter, RevenueRollup, PlatformStats
+from .cache import invalidate_catalog
+from .serializers import OffersSerializer
+
+
+class OfferBulkImporter:
+    """
+    Importiert Angebote aus einem NDJSON-Stream (ein Angebot mit Details pro Zeile).
+
+    Jede Zeile wird mit `OffersSerializer` validiert. Gültige Angebote werden in Blöcken von
+    `chunk_size` Zeilen mit `bulk_create` in je einer Transaktion geschrieben; die Kennzahlen
+    (Preis, Lieferzeiten) werden dabei direkt aus den Details berechnet. Für jede Zeile wird
+    ein Ergebnis als NDJSON-Zeile erzeugt, sodass der Speicherbedarf unabhängig von der
+    Größe des Uploads bleibt.
+
+    Args:
+        user (User): Der Geschäftsbenutzer, dem die Angebote gehören.
+        context (dict): Serializer-Kontext der View.
+        chunk_size (int): Anzahl Zeilen pro Transaktion.
+    """
+
+    def __init__(self, user, context, chunk_size=100):
+        self.user = user
+        self.context = context
+        self.chunk_size = chunk_size
+
+    def run(self, lines):
+        """
+        Liest die Zeilen und liefert die Ergebnisse zeilenweise als NDJSON.
+        """
+        chunk = []
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            chunk.append(self.validate_line(line_number, line))
+            if len(chunk) >= self.chunk_size:
+                yield from self.write_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self.write_chunk(chunk)
+
+    def validate_line(self, line_number, line):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return {'line': line_number, 'errors': {'non_field_errors': ['Ungültiges JSON.']}}
+
+        if not isinstance(data, dict):
+            return {'line': line_number, 'errors': {'non_field_errors': ['Jede Zeile muss ein JSON-Objekt sein.']}}
+
+        serializer = OffersSerializer(data=data, context=self.context)
+        if not serializer.is_valid():
+            return {'line': line_number, 'errors': serializer.errors}
+        return {'line': line_number, 'data': serializer.validated_data}
+
+    def build_offer(self, validated_data):
+        offer_data = dict(validated_data)
+        details_data = offer_data.pop('details')
+        prices = [detail['price'] for detail in details_data]
+        delivery_times = [detail.get('delivery_time_in_days', 1) for detail in details_data]
+        offer = Offers(
+            user=self.user,
+            min_price=min(prices, default=None),
+            min_delivery_time=min(delivery_times, default=None),
+            max_delivery_time=max(delivery_times, default=None),
+            **offer_data
+        )
+        return offer, details_data
+
+    def write_chunk(self, chunk):
+        valid = [item for item in chunk if 'data' in item]
+        if valid:
+            try:
+                with transaction.atomic():
+                    built = [self.build_offer(item['data']) for item in valid]
+                    offers = Offers.objects.bulk_create([offer for offer, _ in built])
+                    OfferDetails.objects.bulk_create([
+                        OfferDetails(offer=offer, **detail)
+                        for offer, details_data in zip(offers, (details for _, details in built))
+                        for detail in details_data
+                    ])
+                    PlatformStats.objects.adjust(offer_count=len(offers))
+                    transaction.on_commit(invalidate_catalog)
+                for item, offer in zip(valid, offers):
+                    item['id'] = offer.pk
+            except DatabaseError:
+                for item in valid:
+                    item['errors'] = {'non_field_errors': ['Angebot konnte nicht gespeichert werden.']}
+
+        for item in chunk:
+            if 'id' in item:
+                result = {'line': item['line'], 'status': 'created', 'id': item['id']}
+            else:
+                result = {'line': item['line'], 'status': 'error', 'errors': item['errors']}
+            yield json.dumps(result) + '\n'
+
+
+class OrderStatusBulkUpdater:
+    """
+    Setzt den Status mehrerer Bestellungen eines Anbieters in einem Schritt.
+
+    Besitz und aktueller Status werden mit einer Abfrage gelesen, die Änderung wird als ein
+    `UPDATE ... WHERE id IN (...)` inklusive `updated_at` geschrieben. Da dabei keine Signale
+    ausgelöst werden, passt der Updater Bestellzähler und Umsatz-Rollups der Anbieter selbst an.
+
+    Args:
+        user (User): Der anfragende Benutzer. Administratoren dürfen alle Bestellungen ändern,
+            Geschäftsbenutzer nur ihre eigenen.
+    """
+    NOT_FOUND = 'not_found'
+    NOT_OWNER = 'not_owner'
+    UNCHANGED = 'unchanged'
+
+    def __init__(self, user):
+        self.user = user
+        self.changed_orders = []
+
+    @transaction.atomic
+    def run(self, order_ids, status):
+        """
+        Ändert den Status und gibt die geänderten sowie die übersprungenen IDs mit Grund zurück.
+
+        Die geänderten Bestellungen mit ihrem vorherigen Status stehen danach in `changed_orders`.
+        """
+        orders = {
+            order['id']: order
+            for order in Orders.objects.filter(id__in=order_ids).values('id', 'customer_user_id', 'business_user_id', 'status', 'price', 'created_at')
+        }
+
+        updated, skipped = [], []
+        transitions = Counter()
+        revenue_transitions = {}
+        for order_id in dict.fromkeys(order_ids):
+            order = orders.get(order_id)
+            if order is None:
+                skipped.append({'id': order_id, 'reason': self.NOT_FOUND})
+            elif not self.user.is_staff and order['business_user_id'] != self.user.id:
+                skipped.append({'id': order_id, 'reason': self.NOT_OWNER})
+            elif order['status'] == status:
+                skipped.append({'id': order_id, 'reason': self.UNCHANGED})
+            else:
+                updated.append(order_id)
+                self.changed_orders.append(order)
+                transitions[(order['business_user_id'], order['status'])] += 1
+                key = (order['business_user_id'], timezone.localdate(order['created_at']), order['status'])
+                count, amount = revenue_transitions.get(key, (0, 0))
+                revenue_transitions[key] = (count + 1, amount + order['price'])
+
+        if updated:
+            Orders.objects.filter(id__in=updated).update(status=status, updated_at=timezone.now())
+            self.update_counters(transitions, status)
+            self.update_revenue_rollups(revenue_transitions, status)
+
+        return {'updated': updated, 'skipped': skipped}
+
+    def update_counters(self, transitions, status):
+        """
+        Überträgt die Statuswechsel gebündelt je Anbieter auf die Bestellzähler.
+        """
+        incoming = Counter()
+        for (business_user_id, previous_status), count in transitions.items():
+            OrderStatusCounter.objects.adjust(business_user_id, previous_status, -count)
+            incoming[business_user_id] += count
+        for business_user_id, count in incoming.items():
+            OrderStatusCounter.objects.adjust(business_user_id, status, count)
+
+    def update_revenue_rollups(self, revenue_transitions, status):
+        """
+        Verschiebt Anzahl und Umsatz der geänderten Bestellungen je Anbieter und Tag in den neuen Status.
+        """
+        for (business_user_id, day, previous_status), (count, amount) in revenue_transitions.items():
+            RevenueRollup.objects.adjust(business_user_id, day, previous_status, -count, -amount)
+            RevenueRollup.objects.adjust(business_user_id, day, status, count, amount)
@@ -0,0 +1,226 @@
+import hashlib
+import uuid
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+
+CACHE_PREFIX = 'offers-cache'
+CATALOG_VERSION_KEY = f'{CACHE_PREFIX}:catalog-version'
+SEARCH_VERSION_KEY = f'{CACHE_PREFIX}:search-version'
+INVALIDATIONS_KEY = f'{CACHE_PREFIX}:invalidations'
+HITS_KEY = f'{CACHE_PREFIX}:hits'
+MISSES_KEY = f'{CACHE_PREFIX}:misses'
+
+
+def get_cache():
+    """
+    Gibt den für den Angebotskatalog konfigurierten Cache zurück.
+    """
+    return caches[settings.OFFERS_CACHE_ALIAS]
+
+
+def is_shared_cache():
+    """
+    Prüft, ob der Angebotscache von allen Workern geteilt wird.
+
+    Ein prozesslokaler Cache würde bei einer Änderung nur im schreibenden Worker invalidiert;
+    die übrigen lieferten bis zum Ablauf veraltete Antworten.
+    """
+    return not isinstance(get_cache(), LocMemCache)
+
+
+def offer_version_key(offer_id):
+    return f'{CACHE_PREFIX}:offer-version:{offer_id}'
+
+
+def get_versions(keys):
+    """
+    Liest Versionsmarken aus dem Cache und legt fehlende mit einem neuen Wert an.
+
+    Eine Versionsmarke wird beim Invalidieren gelöscht; jeder Eintrag, der mit der alten
+    Marke gespeichert wurde, passt danach nicht mehr.
+    """
+    cache = get_cache()
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return versions
+
+
+def invalidate_catalog():
+    """
+    Invalidiert alle gecachten Angebotslisten, z. B. wenn sich Zusammensetzung oder
+    Sortierung der Listen ändern kann.
+    """
+    get_cache().delete(CATALOG_VERSION_KEY)
+    mark_invalidation()
+
+
+def invalidate_search():
+    """
+    Invalidiert nur gecachte Angebotslisten mit Suchbegriff.
+    """
+    get_cache().delete(SEARCH_VERSION_KEY)
+    mark_invalidation()
+
+
+def invalidate_offers(offer_ids):
+    """
+    Invalidiert alle gecachten Antworten, die eines der angegebenen Angebote enthalten.
+    """
+    get_cache().delete_many([offer_version_key(offer_id) for offer_id in offer_ids])
+    mark_invalidation()
+
+
+def mark_invalidation():
+    """
+    Setzt nach jeder Invalidierung eine neue Marke.
+
+    Anders als ein Zähler ändert sich die Marke auch dann, wenn zwei Worker gleichzeitig
+    invalidieren und das Backend kein atomares `incr` kennt (z. B. `FileBasedCache`).
+    """
+    get_cache().set(INVALIDATIONS_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def increment_counter(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats():
+    """
+    Gibt die Treffer- und Fehlzugriffszähler des Angebotscaches über alle Worker zurück.
+
+    Kennt das Backend kein atomares `incr`, können bei gleichzeitigen Zugriffen einzelne
+    Zählungen verloren gehen.
+    """
+    counters = get_cache().get_many([HITS_KEY, MISSES_KEY])
+    return {'hits': counters.get(HITS_KEY, 0), 'misses': counters.get(MISSES_KEY, 0)}
+
+
+def normalize_query(request):
+    """
+    Normalisiert den Query-String: Parameter werden sortiert, leere Werte entfernt.
+    """
+    items = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    return urlencode(items)
+
+
+class CachedCatalogMixin:
+    """
+    Mixin für `OffersViewSet`, das `list` und `retrieve` für anonyme GET-Anfragen cacht.
+
+    Der Schlüssel ergibt sich aus Aktion, Host und normalisiertem Query-String. Jeder Eintrag
+    merkt sich die Versionsmarken der enthaltenen Angebote; ändert sich ein Angebot, sind nur
+    die Einträge ungültig, die es enthalten. Listen hängen zusätzlich an der Katalogversion
+    (neue/gelöschte Angebote, geänderte Preise und Lieferzeiten) und Suchlisten an der
+    Suchversion (geänderte Titel und Beschreibungen).
+
+    `ETag` und `Last-Modified` werden mitgespeichert, sodass bedingte Anfragen bei einem
+    Treffer ohne Datenbankzugriff mit `304` beantwortet werden. Ist der Cache prozesslokal
+    (`LocMemCache`), wird nicht gecacht.
+    """
+    cached_headers = ('ETag', 'Last-Modified')
+
+    def is_cacheable(self, request):
+        return request.method == 'GET' and not request.user.is_authenticated and is_shared_cache()
+
+    def get_cache_key(self, request, **kwargs):
+        parts = [self.action, request.get_host(), normalize_query(request)]
+        if self.action == 'list':
+            keys = [CATALOG_VERSION_KEY]
+            if request.query_params.get('search'):
+                keys.append(SEARCH_VERSION_KEY)
+            versions = get_versions(keys)
+            parts.extend(versions[key] for key in keys)
+        else:
+            parts.append(str(kwargs.get(self.lookup_url_kwarg or self.lookup_field)))
+        digest = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+        return f'{CACHE_PREFIX}:response:{digest}'
+
+    def get_cached_offer_ids(self, data):
+        if 'results' in data:
+            return [offer['id'] for offer in data['results']]
+        return [data['id']]
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_cache_key(request, **kwargs)
+        entry = cache.get(key)
+        if entry is not None:
+            current = cache.get_many(list(entry['versions']))
+            if current == entry['versions']:
+                increment_counter(HITS_KEY)
+                return self.cached_entry_response(request, entry)
+
+        increment_counter(MISSES_KEY)
+        versions = self.get_versions_before_handler(**kwargs)
+        invalidations = cache.get(INVALIDATIONS_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        if versions is None:
+            version_keys = [offer_version_key(offer_id) for offer_id in self.get_cached_offer_ids(response.data)]
+            versions = get_versions(version_keys)
+            if cache.get(INVALIDATIONS_KEY) != invalidations:
+                return response
+        cache.set(key, {
+            'data': response.data,
+            'headers': {header: response[header] for header in self.cached_headers if response.has_header(header)},
+            'versions': versions,
+        }, timeout=settings.OFFERS_CACHE_TIMEOUT)
+        return response
+
+    def get_versions_before_handler(self, **kwargs):
+        """
+        Liest bzw. erzeugt die Versionsmarken, bevor die Antwort aus der Datenbank gelesen wird.
+
+        Bei `retrieve` ist das Angebot vorab bekannt; wird es während der Abfrage
+        invalidiert, passt der Eintrag sofort nicht mehr. Bei Listen stehen die Angebote erst
+        nach der Abfrage fest (Rückgabe `None`): Dann wird nur gecacht, wenn zwischen Beginn
+        der Abfrage und dem Lesen der Marken keine Invalidierung stattfand, da eine gelöschte
+        Marke sonst neu erzeugt und die veraltete Antwort darunter gespeichert würde.
+        """
+        if self.action != 'retrieve':
+            return None
+        return get_versions([offer_version_key(kwargs.get(self.lookup_url_kwarg or self.lookup_field))])
+
+    def cached_entry_response(self, request, entry):
+        headers = entry.get('headers', {})
+        last_modified = headers.get('Last-Modified')
+        response = get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=last_modified and parse_http_date_safe(last_modified)
+        )
+        if response is None:
+            response = Response(entry['data'])
+        for header, value in headers.items():
+            response.headers.setdefault(header, value)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
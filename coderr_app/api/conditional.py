@@ -0,0 +1,68 @@
+import hashlib
+from django.db.models import Count, F, Max
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from .cache import normalize_query
+
+
+class ConditionalGetMixin:
+    """
+    Mixin für bedingte GET-Anfragen (`If-None-Match`, `If-Modified-Since`).
+
+    Die Validatoren werden aus günstigen Abfragen ermittelt, bevor serialisiert wird:
+    - Listen: `MAX(last_modified_field)` und `COUNT(*)` über die gefilterte Abfrage sowie der
+      normalisierte Query-String, damit Seiten, Cursor, Seitengrößen und Sortierungen
+      derselben Filterung unterschiedliche ETags erhalten.
+    - Einzelobjekte: `last_modified_field` des Objekts (ohne Prefetches).
+
+    Stimmen die Validatoren mit den Headern der Anfrage überein, wird `304 Not Modified`
+    zurückgegeben, ohne die Daten zu serialisieren. Sonst werden `ETag` und `Last-Modified`
+    an die Antwort angehängt.
+
+    Attribute:
+        - last_modified_field (str): Feld bzw. Pfad des Änderungszeitpunkts.
+    """
+    last_modified_field = 'updated_at'
+
+    def build_validators(self, *parts, last_modified=None):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        key = ':'.join(str(part) for part in (*parts, last_modified.isoformat() if last_modified else ''))
+        etag = quote_etag(hashlib.md5(key.encode('utf-8')).hexdigest())
+        return etag, timestamp
+
+    def get_list_validators(self):
+        aggregates = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last_modified=Max(self.last_modified_field),
+            count=Count('pk')
+        )
+        return self.build_validators(
+            'list', normalize_query(self.request), aggregates['count'], last_modified=aggregates['last_modified']
+        )
+
+    def get_object_validators(self):
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).annotate(
+            conditional_last_modified=F(self.last_modified_field)
+        )
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, obj)
+        return self.build_validators('object', obj.pk, last_modified=obj.conditional_last_modified)
+
+    def conditional_response(self, request, get_validators, handler, *args, **kwargs):
+        etag, last_modified = get_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+            if last_modified is not None:
+                response.headers.setdefault('Last-Modified', http_date(last_modified))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.get_list_validators, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.get_object_validators, super().retrieve, *args, **kwargs)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import threading
+
+
+class OrderEventSubscription:
+    """
+    Abonnement eines Benutzers auf Bestellereignisse.
+
+    Ereignisse werden thread-sicher in die Queue der Event-Loop des Abonnenten gelegt, da
+    synchrone Views in einem anderen Thread veröffentlichen. Läuft die Queue über, wird das
+    Abonnement beendet, statt Ereignisse unbemerkt zu verlieren; der Client verbindet sich
+    dann neu.
+    """
+
+    def __init__(self, broker, user_id, max_queue_size):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.closed = False
+
+    def deliver(self, event):
+        """
+        Übergibt ein Ereignis aus einem beliebigen Thread an die Event-Loop des Abonnenten.
+        """
+        if not self.closed and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.enqueue, event)
+
+    def enqueue(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+
+    async def get(self):
+        """
+        Wartet auf das nächste Ereignis; `None` signalisiert das Ende des Abonnements.
+        """
+        if self.closed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+    def close(self):
+        """
+        Beendet das Abonnement und weckt einen wartenden Leser auf.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.broker.unsubscribe(self)
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.wake_up)
+
+    def wake_up(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class OrderEventBroker:
+    """
+    In-Process Pub/Sub für Bestellereignisse, adressiert nach Benutzer-ID.
+
+    Die Zustellung erfolgt nur innerhalb des Prozesses; bei mehreren Worker-Prozessen
+    erhalten Clients nur Ereignisse ihres eigenen Prozesses.
+    """
+    max_queue_size = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+
+    def subscribe(self, user_id):
+        """
+        Legt ein Abonnement für die laufende Event-Loop an.
+        """
+        subscription = OrderEventSubscription(self, user_id, self.max_queue_size)
+        with self.lock:
+            self.subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.user_id, None)
+
+    def publish(self, user_ids, event):
+        """
+        Stellt ein Ereignis allen Abonnements der angegebenen Benutzer zu.
+        """
+        with self.lock:
+            subscriptions = [subscription for user_id in set(user_ids) for subscription in self.subscriptions.get(user_id, ())]
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def subscriber_count(self):
+        with self.lock:
+            return sum(len(subscriptions) for subscriptions in self.subscriptions.values())
+
+
+broker = OrderEventBroker()
+
+
+def publish_order_created(order):
+    """
+    Meldet eine neue Bestellung an Kunde und Anbieter.
+
+    Args:
+        order (dict): Ausgabe von `OrdersSerializer`.
+    """
+    broker.publish([order['customer_user'], order['business_user']], {'event': 'order.created', 'data': order})
+
+
+def publish_order_status_changed(order_id, customer_user_id, business_user_id, status, previous_status):
+    """
+    Meldet eine Statusänderung an Kunde und Anbieter der Bestellung.
+    """
+    broker.publish([customer_user_id, business_user_id], {
+        'event': 'order.status_changed',
+        'data': {
+            'id': order_id,
+            'customer_user': customer_user_id,
+            'business_user': business_user_id,
+            'status': status,
+            'previous_status': previous_status,
+        },
+    })
+
+
+class OrderEventStream:
+    """
+    Asynchroner Iterator, der die Ereignisse eines Abonnements als Server-Sent Events ausgibt.
+
+    Ohne Ereignisse wird alle `heartbeat_interval` Sekunden ein Kommentar gesendet, damit
+    Proxys die Verbindung offen halten. `close()` wird von Django beim Schließen der Antwort
+    aufgerufen und beendet das Abonnement.
+    """
+    retry_ms = 5000
+
+    def __init__(self, subscription, heartbeat_interval):
+        self.subscription = subscription
+        self.heartbeat_interval = heartbeat_interval
+        self.started = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.started:
+            self.started = True
+            return f'retry: {self.retry_ms}\n\n'
+        try:
+            event = await asyncio.wait_for(self.subscription.get(), timeout=self.heartbeat_interval)
+        except asyncio.TimeoutError:
+            return ': keepalive\n\n'
+        if event is None:
+            raise StopAsyncIteration
+        return f'event: {event["event"]}\ndata: {json.dumps(event["data"], default=str)}\n\n'
+
+    def close(self):
+        self.subscription.close()
@@ -0,0 +1,58 @@
+import json
+from .serializers import OffersSerializer
+
+
+OFFER_CSV_HEADER = [
+    'offer_id', 'user', 'title', 'description', 'created_at', 'updated_at',
+    'min_price', 'min_delivery_time', 'max_delivery_time',
+    'detail_id', 'detail_title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type',
+]
+
+
+class OfferCatalogExporter:
+    """
+    Erzeugt den vollständigen Angebotskatalog zeilenweise für den Export.
+
+    Die Angebote werden mit `QuerySet.iterator(chunk_size=...)` gelesen; Ersteller und
+    Angebotsdetails werden pro Block per Join bzw. Prefetch geladen. So bleibt der
+    Speicherbedarf unabhängig von der Größe des Katalogs.
+
+    Args:
+        queryset (QuerySet): Die (gefilterte) Abfrage der Angebote.
+        context (dict): Serializer-Kontext der View.
+        chunk_size (int): Anzahl Angebote pro Datenbankblock.
+    """
+
+    def __init__(self, queryset, context, chunk_size=500):
+        self.queryset = queryset
+        self.context = context
+        self.chunk_size = chunk_size
+
+    def offers(self):
+        return self.queryset.select_related('user').prefetch_related('details').iterator(chunk_size=self.chunk_size)
+
+    def ndjson_rows(self):
+        """
+        Ein Objekt pro Angebot inklusive Details, wie in `/offers/{id}/`.
+        """
+        for offer in self.offers():
+            yield OffersSerializer(offer, context=self.context).data
+
+    def csv_rows(self):
+        """
+        Eine Zeile pro Angebotsdetail; Angebote ohne Details erscheinen mit leeren Detailspalten.
+        """
+        for offer in self.offers():
+            offer_columns = [
+                offer.pk, offer.user_id, offer.title, offer.description,
+                offer.created_at.isoformat(), offer.updated_at.isoformat(),
+                offer.min_price, offer.min_delivery_time, offer.max_delivery_time,
+            ]
+            details = list(offer.details.all())
+            if not details:
+                yield offer_columns + [None] * 7
+            for detail in details:
+                yield offer_columns + [
+                    detail.pk, detail.title, detail.revisions, detail.delivery_time_in_days,
+                    detail.price, json.dumps(detail.features, ensure_ascii=False), detail.offer_type,
+                ]
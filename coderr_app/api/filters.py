@@ -0,0 +1,59 @@
+import re
+from django.db import connection
+from rest_framework import filters
+
+
+class OfferFullTextSearchFilter(filters.SearchFilter):
+    """
+    Volltextsuche für Angebote über den SQLite-FTS5-Index `coderr_app_offers_fts`.
+
+    Jeder Suchbegriff wird als Präfix gesucht (`web` findet `Webdesign`), alle Begriffe
+    müssen vorkommen. Treffer werden mit `search_rank` (bm25, kleiner ist besser) annotiert,
+    wobei Treffer im Titel stärker gewichtet werden als in der Beschreibung. Der FTS-Index
+    wird dazu einmal per Join eingebunden, sodass Filter und Rang aus demselben `MATCH` stammen.
+
+    Auf anderen Datenbanken wird auf die `LIKE`-Suche von `SearchFilter` zurückgegriffen.
+    """
+    fts_table = 'coderr_app_offers_fts'
+    title_weight = 10.0
+    description_weight = 1.0
+
+    def build_match_query(self, terms):
+        """
+        Wandelt die Suchbegriffe in eine FTS5-Abfrage mit Präfixsuche um.
+        """
+        tokens = [token for term in terms for token in re.findall(r'\w+', term)]
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def filter_queryset(self, request, queryset, view):
+        if connection.vendor != 'sqlite':
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        match_query = self.build_match_query(terms)
+        if not match_query:
+            return queryset.none()
+
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[self.fts_table],
+            where=[f'{self.fts_table} MATCH %s', f'{self.fts_table}.rowid = "{table}"."id"'],
+            params=[match_query],
+            select={'search_rank': f'bm25({self.fts_table}, %s, %s)'},
+            select_params=[self.title_weight, self.description_weight],
+        )
+
+
+class OfferOrderingFilter(filters.OrderingFilter):
+    """
+    Sortierung für Angebote, die bei einer Volltextsuche ohne explizites `ordering`
+    nach Relevanz (`search_rank`) sortiert.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and 'search_rank' in queryset.query.extra:
+            return ['search_rank', *(self.get_default_ordering(view) or [])]
+        return super().get_ordering(request, queryset, view)
@@ -1,4 +1,12 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class LargeResultsSetPagination(PageNumberPagination):
@@ -13,4 +21,193 @@ class LargeResultsSetPagination(PageNumberPagination):
     """
     page_size = 6
     page_size_query_param = 'page_size'
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor-Paginator auf Basis von Keyset-Abfragen (`WHERE (feld, id) > (wert, id)`).
+
+    Im Gegensatz zur Seitennummerierung wird weder ein `COUNT(*)` noch ein `OFFSET`
+    ausgeführt. Sortiert wird nach einem Feld mit `id` als eindeutigem Tie-Breaker;
+    `next` und `previous` enthalten undurchsichtige Cursor.
+
+    Attribute:
+        - page_size (int): Standardanzahl der Elemente pro Seite.
+        - page_size_query_param (str): Name des Parameters zur Anpassung der Seitengröße.
+        - max_page_size (int): Maximale Anzahl von Einträgen pro Seite.
+        - cursor_query_param (str): Name des Cursor-Parameters.
+        - ordering (tuple): Standardsortierung, falls die View keinen `OrderingFilter` nutzt.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at',)
+    invalid_cursor_message = 'Ungültiger Cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginiert die Vereinigung mehrerer Querysets desselben Modells.
+
+        Jedes Queryset wird einzeln per Keyset sortiert und auf `page_size + 1` Einträge
+        begrenzt, sodass es seinen eigenen Index nutzen kann (statt einer Oder-Bedingung mit
+        anschließender Sortierung). Die Teilergebnisse werden in Python zusammengeführt;
+        Einträge, die in mehreren Querysets vorkommen, erscheinen nur einmal.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.field, self.descending = self.get_ordering(request, querysets[0], view)
+        self.model_field = querysets[0].model._meta.get_field(self.field)
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor['reverse'] if cursor else False
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        results = {}
+        for queryset in querysets:
+            queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}id')
+            if cursor:
+                queryset = queryset.filter(self.build_keyset_filter(cursor['value'], cursor['id'], descending))
+            for instance in queryset[:self.page_size + 1]:
+                results.setdefault(instance.pk, instance)
+
+        results = sorted(results.values(), key=self.get_sort_key, reverse=descending)[:self.page_size + 1]
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else cursor is not None
+        self.page = results
+        return results
+
+    def get_sort_key(self, instance):
+        """
+        Sortierschlüssel `(feld, id)` wie in SQLite, wo `NULL` aufsteigend zuerst kommt.
+        """
+        value = getattr(instance, self.field)
+        return (value is not None, value if value is not None else 0, instance.pk)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Ermittelt Sortierfeld und -richtung, bevorzugt aus dem `OrderingFilter` der View.
+
+        Es wird nur das erste Modellfeld der Sortierung verwendet.
+        """
+        ordering = self.ordering
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view) or ordering
+                break
+
+        field_names = {field.name for field in queryset.model._meta.concrete_fields}
+        for item in list(ordering) + list(self.ordering):
+            if item.lstrip('-') in field_names:
+                return item.lstrip('-'), item.startswith('-')
+
+    def build_keyset_filter(self, value, pk, descending):
+        """
+        Liefert die Bedingung für alle Einträge nach `(value, pk)` in Sortierrichtung.
+
+        SQLite sortiert `NULL` aufsteigend zuerst und absteigend zuletzt.
+        """
+        field = self.field
+        if descending:
+            if value is None:
+                return Q(**{f'{field}__isnull': True, 'id__lt': pk})
+            return Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk}) | Q(**{f'{field}__isnull': True})
+
+        if value is None:
+            return Q(**{f'{field}__isnull': True, 'id__gt': pk}) | Q(**{f'{field}__isnull': False})
+        return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk})
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            value = data['v']
+            return {
+                'value': None if value is None else self.model_field.to_python(value),
+                'id': int(data['id']),
+                'reverse': bool(data['r']),
+            }
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse):
+        data = {'v': getattr(instance, self.field), 'id': instance.pk, 'r': reverse}
+        encoded = base64.urlsafe_b64encode(json.dumps(data, default=str).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class OffersCursorPagination(KeysetPagination):
+    """
+    Optionale Cursor-Paginierung für Angebote (`?pagination=cursor`).
+
+    Unterstützt die Sortierungen `created_at`, `min_price` und `max_delivery_time`
+    (jeweils auch absteigend), standardmäßig wird nach `created_at` sortiert.
+
+    Nach Relevanz (`search_rank`) kann per Keyset nicht sortiert werden: Eine Suche ohne
+    `ordering` wird daher mit `400` abgelehnt, statt stillschweigend nach `created_at` zu sortieren.
+    """
+    ordering = ('created_at',)
+    search_without_ordering_message = (
+        'Die Cursor-Paginierung kann nicht nach Relevanz sortieren. '
+        'Für eine Suche bitte `ordering` angeben oder die Seitennummerierung verwenden.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering_param = OrderingFilter.ordering_param
+        if 'search_rank' in queryset.query.extra and not request.query_params.get(ordering_param):
+            raise ValidationError({ordering_param: [self.search_without_ordering_message]})
+        return super().paginate_queryset(queryset, request, view)
+
+
+class OrdersCursorPagination(KeysetPagination):
+    """
+    Cursor-Paginierung für Bestellungen, neueste zuerst (`-created_at`, `-id`).
+    """
+    ordering = ('-created_at',)
+
+
+class ReviewsCursorPagination(KeysetPagination):
+    """
+    Cursor-Paginierung für Bewertungen, standardmäßig zuletzt geänderte zuerst (`-updated_at`, `-id`).
+
+    Über den `OrderingFilter` ist auch `rating` (auf- oder absteigend) möglich.
+    """
+    ordering = ('-updated_at',)
@@ -133,4 +133,20 @@ class IsReviewerOrAdminPermission(permissions.BasePermission):
         if request.method in ['PATCH', 'DELETE']:
             return obj.customer_user == request.user or request.user.is_staff
         
-        return True
\ No newline at end of file
+        return True
+
+
+class BusinessOwnerOrAdminPermission(permissions.BasePermission):
+    """
+    Berechtigung, die den Zugriff auf Daten eines Geschäftsbenutzers nur diesem selbst
+    und Administratoren erlaubt. Die ID wird aus `business_user_id` der URL gelesen.
+
+    **Methoden**:
+    - **has_permission**: Überprüft, ob der Benutzer die Berechtigung hat, auf die Ansicht zuzugreifen.
+    """
+
+    def has_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+
+        return request.user.is_staff or request.user.id == view.kwargs.get('business_user_id')
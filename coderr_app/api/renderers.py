@@ -0,0 +1,63 @@
+import csv
+import json
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer für Newline-Delimited JSON (ein JSON-Objekt pro Zeile).
+
+    `stream(rows)` erzeugt die Zeilen einzeln für `StreamingHttpResponse`.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render_row(self, row):
+        return json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + '\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(self.render_row(row) for row in rows).encode(self.charset)
+
+    def stream(self, rows, header=None):
+        for row in rows:
+            yield self.render_row(row)
+
+
+class _EchoBuffer:
+    """
+    Pseudo-Puffer für `csv.writer`, der die geschriebene Zeile direkt zurückgibt.
+    """
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer für CSV-Dateien.
+
+    `stream(rows, header)` erzeugt Kopfzeile und Datenzeilen einzeln für
+    `StreamingHttpResponse`; `rows` sind Listen in der Reihenfolge von `header`.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        header = list(rows[0]) if rows else []
+        return ''.join(self.stream(([row.get(column) for column in header] for row in rows), header)).encode(self.charset)
+
+    def stream(self, rows, header=None):
+        writer = csv.writer(_EchoBuffer())
+        if header:
+            yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
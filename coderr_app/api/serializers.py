@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from coderr_app.models import UserProfile, OfferDetails, Offers, Orders, Reviews
+from django.db import transaction
+from coderr_app.models import UserProfile, OfferDetails, Offers, Orders, OrdersArchive, Reviews, OrderStatusCounter, BusinessRatingSummary
 from django.contrib.auth.models import User
 
 
@@ -86,9 +87,16 @@ class UserSerializer(serializers.ModelSerializer):
     def get_file(self, obj):
         """
         Gibt die URL des Profilbildes zurück, wenn vorhanden.
+
+        Das Profil wird über die umgekehrte 1:1-Beziehung gelesen. Wurde der Benutzer über
+        sein Profil geladen (`select_related('user')`), ist es bereits zwischengespeichert
+        und es entsteht keine weitere Abfrage.
         """
-        user_profile = UserProfile.objects.filter(user=obj).first()
-        return user_profile.file.url if user_profile and user_profile.file else None
+        try:
+            user_profile = obj.user_profile
+        except UserProfile.DoesNotExist:
+            return None
+        return user_profile.file.url if user_profile.file else None
 
 
 class UserProfileDetailSerializer(serializers.ModelSerializer):
@@ -129,6 +137,33 @@ class UserProfileDetailSerializer(serializers.ModelSerializer):
         return representation
     
 
+class BusinessProfileDetailSerializer(UserProfileDetailSerializer):
+    """
+    Serializer für Geschäftsprofile mit der vorberechneten Bewertungsübersicht des Anbieters.
+
+    Attributes:
+        rating_summary (SerializerMethodField): Anzahl, Durchschnitt und Sterne-Histogramm der Bewertungen.
+    """
+    rating_summary = serializers.SerializerMethodField()
+
+    class Meta(UserProfileDetailSerializer.Meta):
+        fields = UserProfileDetailSerializer.Meta.fields + ['rating_summary']
+
+    def get_rating_summary(self, obj):
+        """
+        Gibt die Bewertungsübersicht zurück; ohne Bewertungen sind alle Werte 0.
+        """
+        try:
+            summary = obj.user.rating_summary
+        except BusinessRatingSummary.DoesNotExist:
+            summary = BusinessRatingSummary(business_user=obj.user)
+        return {
+            'review_count': summary.review_count,
+            'average_rating': summary.average_rating,
+            'histogram': summary.histogram,
+        }
+
+
 class CustomerProfileDetailSerializer(UserProfileDetailSerializer):
     """
     Serializer für Kundenprofile, der das `created_at`-Feld als `uploaded_at` zurückgibt.
@@ -197,9 +232,12 @@ class OffersSerializer(serializers.ModelSerializer):
         model = Offers
         fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_delivery_time', 'min_price', 'user_details', 'max_delivery_time']
 
+    @transaction.atomic
     def create(self, validated_data):
         """
         Erstellt ein neues Angebot mit Validierung und Details.
+
+        Die Kennzahlen (Preis, Lieferzeiten) werden in derselben Transaktion gespeichert.
         """
         details_data = validated_data.pop('details')
         validated_data['user'] = self.context['request'].user
@@ -208,13 +246,20 @@ class OffersSerializer(serializers.ModelSerializer):
         for detail in details_data:
             if 'price' not in detail:
                 raise serializers.ValidationError({'details': ['Jedes Detail muss einen Preis haben!']})
-            OfferDetails.objects.create(offer=offer, **detail)
+        OfferDetails.objects.bulk_create([OfferDetails(offer=offer, **detail) for detail in details_data])
+        offer.update_aggregates()
 
         return offer
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         """
         Aktualisiert das Angebot und seine Details.
+
+        Details werden über `offer_type` zugeordnet: Bestehende Details behalten ihre ID und
+        nur geänderte Felder werden per `bulk_update` geschrieben, neue Typen werden per
+        `bulk_create` angelegt. Die Kennzahlen (Preis, Lieferzeiten) werden in derselben
+        Transaktion aktualisiert.
         """
         details_data = validated_data.pop('details', None)
         instance.title = validated_data.get('title', instance.title)
@@ -223,13 +268,45 @@ class OffersSerializer(serializers.ModelSerializer):
         instance.save()
 
         if details_data:
-            instance.details.all().delete()
-
-            for detail in details_data:
-                OfferDetails.objects.create(offer=instance, **detail)
+            self.update_details(instance, details_data)
 
         return instance
 
+    def update_details(self, instance, details_data):
+        """
+        Gleicht die Angebotsdetails differenziell mit den übergebenen Daten ab.
+        """
+        existing_details = {detail.offer_type: detail for detail in instance.details.all()}
+        changed_details = {}
+        changed_fields = set()
+        new_details = []
+
+        for detail_data in details_data:
+            offer_type = detail_data.get('offer_type')
+            if offer_type is None:
+                raise serializers.ValidationError({'details': ['Jedes Detail muss einen offer_type haben!']})
+
+            detail = existing_details.get(offer_type)
+            if detail is None:
+                missing_fields = [field for field in ('title', 'price', 'features') if field not in detail_data]
+                if missing_fields:
+                    raise serializers.ValidationError({'details': [f'Neue Details benötigen die Felder: {", ".join(missing_fields)}.']})
+                new_details.append(OfferDetails(offer=instance, **detail_data))
+                continue
+
+            for field, value in detail_data.items():
+                if getattr(detail, field) != value:
+                    setattr(detail, field, value)
+                    changed_fields.add(field)
+                    changed_details[detail.pk] = detail
+
+        if changed_details:
+            OfferDetails.objects.bulk_update(changed_details.values(), sorted(changed_fields))
+        if new_details:
+            OfferDetails.objects.bulk_create(new_details)
+        if changed_details or new_details:
+            instance.update_aggregates()
+
     def get_user_details(self, obj):
         """
         Gibt Benutzerdetails zurück, die das Angebot erstellt haben.
@@ -243,26 +320,18 @@ class OffersSerializer(serializers.ModelSerializer):
 
 class OrdersSerializer(serializers.ModelSerializer):
     """
-    Serializer für das Orders-Modell mit Feldern, die aus verbundenen Offer- und OfferDetails-Modellen abgeleitet sind.
-    
-    Attributes:
-        title (CharField): Titel des Angebots.
-        revisions (IntegerField): Anzahl der Revisionen des Angebots.
-        delivery_time_in_days (IntegerField): Lieferzeit des Angebots.
-        price (DecimalField): Preis des Angebots.
-        features (JSONField): Funktionen des Angebots.
-        offer_type (CharField): Typ des Angebots.
+    Serializer für das Orders-Modell.
+
+    Titel, Revisionen, Lieferzeit, Preis, Funktionen und Typ werden aus den Snapshot-Spalten
+    der Bestellung gelesen, die beim Anlegen aus Angebot und Angebotsdetail übernommen werden.
+    Die Funktionen stammen aus dem verknüpften `FeatureSnapshot`.
+    Dadurch entstehen beim Auflisten keine zusätzlichen Abfragen, und es wird der Preis
+    ausgegeben, den der Kunde tatsächlich bezahlt hat.
     
     Meta:
         model: Orders
         fields: Alle relevanten Felder des Auftrags.
     """
-    title = serializers.CharField(source='offer.title', required=False)
-    revisions = serializers.IntegerField(source='offer_details.revisions', required=False)
-    delivery_time_in_days = serializers.IntegerField(source='offer_details.delivery_time_in_days', required=False)
-    price = serializers.DecimalField(max_digits=10, decimal_places=2, source='offer_details.price', required=False)
-    features= serializers.JSONField(source='offer_details.features', required=False)
-    offer_type = serializers.CharField(source='offer_details.offer_type', required=False)
 
     class Meta:
         model = Orders
@@ -284,6 +353,33 @@ class OrdersSerializer(serializers.ModelSerializer):
         }
 
 
+class OrdersArchiveSerializer(serializers.ModelSerializer):
+    """
+    Serializer für archivierte Bestellungen mit denselben Feldern wie `OrdersSerializer`.
+
+    Meta:
+        model: OrdersArchive
+        fields: Alle Felder, die auch für aktive Bestellungen ausgegeben werden.
+    """
+
+    class Meta:
+        model = OrdersArchive
+        fields = OrdersSerializer.Meta.fields
+        read_only_fields = OrdersSerializer.Meta.fields
+
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    Eingabe für die Statusänderung mehrerer Bestellungen.
+
+    Attributes:
+        ids (ListField): IDs der zu ändernden Bestellungen, höchstens 500.
+        status (ChoiceField): Neuer Status der Bestellungen.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500)
+    status = serializers.ChoiceField(choices=OrderStatusCounter.STATUSES)
+
+
 class ReviewsSerializer(serializers.ModelSerializer):
     """
     Serializer für das Reviews-Modell, das Bewertungen von Benutzern für Business-Anbieter darstellt.
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+
+def get_process_lock(key):
+    """
+    Gibt die prozessweite Sperre für `key` zurück und legt sie bei Bedarf an.
+    """
+    with _process_locks_guard:
+        return _process_locks.setdefault(key, threading.Lock())
+
+
+def get_lock_path(key):
+    """
+    Pfad der Sperrdatei für `key` in `SINGLE_FLIGHT_LOCK_DIR`.
+    """
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(settings.SINGLE_FLIGHT_LOCK_DIR, f'{digest}.lock')
+
+
+def open_lock_file(key):
+    """
+    Öffnet die Sperrdatei für `key`.
+
+    Gibt `None` zurück, wenn `fcntl` fehlt (z. B. unter Windows) oder die Datei nicht
+    angelegt werden kann; dann wird nur innerhalb des Prozesses gesperrt.
+    """
+    if fcntl is None:
+        return None
+    try:
+        os.makedirs(settings.SINGLE_FLIGHT_LOCK_DIR, exist_ok=True)
+        return open(get_lock_path(key), 'a')
+    except OSError:
+        return None
+
+
+def acquire_file_lock(lock_file, deadline):
+    """
+    Versucht bis `deadline`, die Sperrdatei exklusiv zu sperren (`flock` kennt kein Timeout).
+    """
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+
+
+@contextmanager
+def single_flight_lock(key, timeout):
+    """
+    Sperrt `key` innerhalb des Prozesses (`threading.Lock`) und prozessübergreifend (`flock`).
+
+    Liefert `True`, wenn beide Sperren innerhalb von `timeout` Sekunden erlangt wurden,
+    sonst `False`; bereits erlangte Sperren werden in jedem Fall wieder freigegeben.
+    """
+    deadline = time.monotonic() + timeout
+    process_lock = get_process_lock(key)
+    if not process_lock.acquire(timeout=timeout):
+        yield False
+        return
+    lock_file = None
+    try:
+        lock_file = open_lock_file(key)
+        acquired = lock_file is None or acquire_file_lock(lock_file, deadline)
+        try:
+            yield acquired
+        finally:
+            if lock_file is not None and acquired:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    finally:
+        if lock_file is not None:
+            lock_file.close()
+        process_lock.release()
+
+
+def single_flight(key, compute, lookup, timeout=None):
+    """
+    Berechnet einen fehlenden Wert so, dass gleichzeitig nur ein Worker `compute` ausführt.
+
+    `lookup` liest den vorhandenen Wert (`None`, wenn er fehlt). Fehlt er, wartet der Aufrufer
+    höchstens `timeout` Sekunden (Standard: `SINGLE_FLIGHT_TIMEOUT`) auf die Sperre und liest
+    danach erneut, sodass wartende Worker das Ergebnis des ersten übernehmen. Läuft die
+    Wartezeit ab, wird der dann vorhandene Wert zurückgegeben oder notfalls selbst berechnet.
+    """
+    value = lookup()
+    if value is not None:
+        return value
+
+    timeout = settings.SINGLE_FLIGHT_TIMEOUT if timeout is None else timeout
+    with single_flight_lock(key, timeout) as acquired:
+        value = lookup()
+        if value is not None:
+            return value
+        if acquired:
+            return compute()
+    return compute()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.urls import path, include
-from .views import UserProfileDetailView, BusinessProfilesViewSet, CustomerProfilesViewSet, OffersViewSet, OfferDetailsViewSet, OrdersViewSet, InProgressOrderCountView, CompletedOrderCountView, ReviewsViewSet, BaseInfoView
+from .views import UserProfileDetailView, BusinessProfilesViewSet, CustomerProfilesViewSet, OffersViewSet, OfferDetailsViewSet, OrdersViewSet, InProgressOrderCountView, CompletedOrderCountView, OrderCountsView, BusinessRevenueView, OrderEventsView, OrderEventTicketView, ReviewsViewSet, BaseInfoView
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
@@ -17,6 +17,10 @@ urlpatterns = [
     path('profile/<int:pk>/', UserProfileDetailView.as_view(), name='profile-detail'),
     path('order-count/<int:business_user_id>/', InProgressOrderCountView.as_view(), name='order-count'),
     path('completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('order-counts/', OrderCountsView.as_view(), name='order-counts'),
+    path('order-events/', OrderEventsView.as_view(), name='order-events'),
+    path('order-events/ticket/', OrderEventTicketView.as_view(), name='order-event-ticket'),
+    path('businesses/<int:business_user_id>/revenue/', BusinessRevenueView.as_view(), name='business-revenue'),
     path('base-info/', BaseInfoView.as_view(), name='base-info')
 ]
 
@@ -46,12 +50,18 @@ URLs der API:
 - **POST /orders/**: Erstellt eine neue Bestellung.
 - **PATCH /orders/{id}/**: Aktualisiert eine spezifische Bestellung.
 - **GET /orders/{id}/**: Gibt die Details einer spezifischen Bestellung zurück.
+- **PATCH /orders/bulk-status/**: Setzt den Status mehrerer Bestellungen eines Anbieters.
+- **GET /order-events/**: Server-Sent Events zu neuen Bestellungen und Statusänderungen (nur unter ASGI).
+- **POST /order-events/ticket/**: Stellt ein einmal verwendbares Ticket für `/order-events/?ticket=...` aus.
 - **GET /order-count/{business_user_id}/**: Gibt die Anzahl der offenen Bestellungen für einen bestimmten Geschäftsnutzer zurück.
 - **GET /completed-order-count/{business_user_id}/**: Gibt die Anzahl der abgeschlossenen Bestellungen für einen bestimmten Geschäftsnutzer zurück.
+- **GET /order-counts/?business_user_ids=1,2,3**: Gibt die laufenden und abgeschlossenen Bestellungen mehrerer Geschäftsnutzer zurück.
+- **GET /businesses/{business_user_id}/revenue/?granularity=day|month&from=&to=**: Gibt Bestellanzahl und Umsatz eines Geschäftsnutzers je Tag oder Monat zurück.
 
 ### Bewertungen
 
-- **GET /reviews/**: Gibt eine Liste aller Bewertungen zurück.
+- **GET /reviews/**: Gibt Bewertungen cursor-paginiert zurück (`?ordering=rating`, `?cursor=...`).
+- **GET /reviews/top/**: Gibt je Geschäftsbenutzer die ersten N Bewertungen zurück (`?business_user_ids=1,2&limit=3&ordering=-rating`).
 - **POST /reviews/**: Erstellt eine neue Bewertung.
 - **PATCH /reviews/{id}/**: Aktualisiert eine spezifische Bewertung.
 
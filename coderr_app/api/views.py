@@ -1,17 +1,35 @@
 from rest_framework import generics, viewsets, filters, status
-from coderr_app.models import UserProfile, OfferDetails, Offers, Orders, User, Reviews
-from .serializers import UserProfileSerializer, OfferDetailsSerializer, OffersSerializer, OrdersSerializer, UserProfileDetailSerializer, ReviewsSerializer, CustomerProfileDetailSerializer
-from rest_framework.permissions import IsAuthenticated
-from .permissions import IsObjectOwnerOrAdminPermission, IsBusinessOrAdminPermission, IsCustomerReadOnlyPermission, OrderAccessPermission, IsReviewerOrAdminPermission
-from .paginations import LargeResultsSetPagination
+from coderr_app.models import UserProfile, OfferDetails, Offers, Orders, OrdersArchive, User, Reviews, OrderStatusCounter, RevenueRollup, PlatformStats, OrderEventTicket
+from .serializers import UserProfileSerializer, OfferDetailsSerializer, OffersSerializer, OrdersSerializer, OrdersArchiveSerializer, OrderBulkStatusSerializer, UserProfileDetailSerializer, BusinessProfileDetailSerializer, ReviewsSerializer, CustomerProfileDetailSerializer
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.decorators import action
+from .permissions import IsObjectOwnerOrAdminPermission, IsBusinessOrAdminPermission, IsCustomerReadOnlyPermission, OrderAccessPermission, IsReviewerOrAdminPermission, BusinessOwnerOrAdminPermission
+from .paginations import LargeResultsSetPagination, OffersCursorPagination, OrdersCursorPagination, ReviewsCursorPagination
+from .filters import OfferFullTextSearchFilter, OfferOrderingFilter
+from .cache import CachedCatalogMixin, get_stats as get_offers_cache_stats
+from .conditional import ConditionalGetMixin
+from .singleflight import single_flight
+from .bulk import OfferBulkImporter, OrderStatusBulkUpdater
+from .exports import OfferCatalogExporter, OFFER_CSV_HEADER
+from .renderers import NDJSONRenderer, CSVRenderer
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views import View
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+from coderr_auth_app.api.authentication import ProfileTokenAuthentication
+from . import events as order_events
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min, Subquery, OuterRef
 import django_filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
-class UserProfileDetailView(generics.RetrieveUpdateAPIView):
+class UserProfileDetailView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """
     Ansicht zur Abfrage und Aktualisierung von Benutzerprofilen.
 
@@ -21,6 +39,8 @@ class UserProfileDetailView(generics.RetrieveUpdateAPIView):
     - **GET**: Ruft das Benutzerprofil mit dem angegebenen Primärschlüssel (pk) ab.
     - **PATCH**: Aktualisiert das Benutzerprofil mit dem angegebenen Primärschlüssel (pk).
 
+    Unterstützt bedingte GET-Anfragen (`ETag`/`Last-Modified`, siehe `ConditionalGetMixin`).
+
     **Berechtigungen**: 
     - Der Benutzer muss der Eigentümer des Profils oder ein Administrator sein.
     """
@@ -37,20 +57,22 @@ class BusinessProfilesViewSet(viewsets.ModelViewSet):
     **URL**: `/profiles/business/`
 
     **Methoden**:
-    - **GET**: Listet alle Geschäftprofile auf.
+    - **GET**: Listet alle Geschäftprofile inklusive Bewertungsübersicht (`rating_summary`) auf.
     - **POST**: Erstellt ein neues Geschäftprofil.
 
     **Berechtigungen**:
     - Erfordert Authentifizierung.
     """
     permission_classes = [IsAuthenticated]
-    serializer_class = UserProfileDetailSerializer
+    serializer_class = BusinessProfileDetailSerializer
 
     def get_queryset(self):
         """
         Gibt nur Geschäftsbenutzerprofile zurück.
+
+        Benutzer und Bewertungsübersicht werden per Join mitgeladen.
         """
-        return UserProfile.objects.filter(type='business')
+        return UserProfile.objects.filter(type='business').select_related('user', 'user__rating_summary')
     
 
 class CustomerProfilesViewSet(viewsets.ModelViewSet):
@@ -71,9 +93,9 @@ class CustomerProfilesViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """
-        Gibt nur Kundenbenutzerprofile zurück.
+        Gibt nur Kundenbenutzerprofile zurück, der Benutzer wird per Join mitgeladen.
         """
-        return UserProfile.objects.filter(type='customer')
+        return UserProfile.objects.filter(type='customer').select_related('user')
     
 
 class OfferFilter(django_filters.FilterSet):
@@ -89,12 +111,13 @@ class OfferFilter(django_filters.FilterSet):
 
     def filter_by_max_delivery_time(self, queryset, name, value):
         """
-        Filtert Angebote nach maximaler Lieferzeit.
+        Filtert Angebote, die mindestens ein Angebotsdetail mit einer Lieferzeit
+        kleiner oder gleich dem angegebenen Wert haben.
         """
-        return queryset.filter(max_delivery_time__lte=value)
+        return queryset.filter(min_delivery_time__lte=value)
      
 
-class OffersViewSet(viewsets.ModelViewSet):
+class OffersViewSet(CachedCatalogMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet zur Verwaltung von Angeboten.
 
@@ -102,6 +125,14 @@ class OffersViewSet(viewsets.ModelViewSet):
 
     **Methoden**:
     - **GET**: Listet alle Angebote mit optionalen Filtern und Suchanfragen auf.
+      Die Suche (`search`) nutzt den FTS5-Volltextindex und sortiert ohne `ordering` nach Relevanz.
+      Mit `pagination=cursor` wird statt der Seitennummerierung eine Cursor-Paginierung ohne `COUNT(*)` genutzt;
+      zusammen mit `search` ist dort eine `ordering` erforderlich, da nicht nach Relevanz sortiert werden kann.
+      Anonyme Abfragen werden gecacht (siehe `CachedCatalogMixin`), bedingte GET-Anfragen
+      werden mit `304` beantwortet (siehe `ConditionalGetMixin`).
+    - **GET** `/offers/cache-stats/`: Treffer- und Fehlzugriffszähler des Caches (nur Administratoren).
+    - **POST** `/offers/bulk/`: Importiert Angebote aus einem NDJSON-Body (ein Angebot pro Zeile).
+    - **GET** `/offers/export/?format=ndjson|csv`: Streamt den gesamten Katalog inklusive Details.
     - **POST**: Erstellt ein neues Angebot.
     - **PATCH**: Aktualisiert ein bestehendes Angebot.
     - **DELETE**: Entfernt ein Angebot.
@@ -113,11 +144,13 @@ class OffersViewSet(viewsets.ModelViewSet):
     serializer_class = OffersSerializer
     queryset = Offers.objects.all()
     pagination_class = LargeResultsSetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OfferFullTextSearchFilter, OfferOrderingFilter]
     filterset_class = OfferFilter
     ordering_fields = ['min_price', 'created_at', 'max_delivery_time']
     ordering = ['created_at']
     search_fields = ['title', 'description']
+    bulk_chunk_size = 100
+    export_chunk_size = 500
 
     def get_serializer_context(self):
         """
@@ -127,26 +160,70 @@ class OffersViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
 
+    @property
+    def paginator(self):
+        """
+        Nutzt die Cursor-Paginierung, wenn sie per `pagination=cursor` angefordert wird
+        oder bereits ein Cursor übergeben wurde. Standard bleibt die Seitennummerierung.
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or OffersCursorPagination.cursor_query_param in params:
+                self._paginator = OffersCursorPagination()
+        return super().paginator
+
     def get_queryset(self):
         """
-        Annotiert Angebote mit dem minimalen Preis und der minimalen/maximalen Lieferzeit.
+        Lädt den Ersteller per Join und die Angebotsdetails per Prefetch, damit die Anzahl
+        der Abfragen unabhängig von der Seitengröße bleibt.
         """
-        min_price_subquery = OfferDetails.objects.filter(offer=OuterRef('pk')).values('offer').annotate(
-            min_price=Min('price')
-        ).values('min_price')
+        return Offers.objects.select_related('user').prefetch_related('details')
 
-        min_delivery_time_subquery = OfferDetails.objects.filter(offer=OuterRef('pk')).values('offer').annotate(
-            min_delivery_time=Min('delivery_time_in_days')
-        ).values('min_delivery_time')
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+        Gibt die Treffer- und Fehlzugriffszähler des Angebotscaches zurück.
+        """
+        return Response(get_offers_cache_stats())
 
-        return Offers.objects.annotate(
-            min_price=Subquery(min_price_subquery),
-            min_delivery_time=Subquery(min_delivery_time_subquery),
-            max_delivery_time=Subquery(min_delivery_time_subquery)
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Importiert Angebote aus einem gestreamten NDJSON-Body.
+
+        Die Antwort wird ebenfalls als NDJSON gestreamt und enthält pro Zeile den Status
+        (`created` mit `id` oder `error` mit `errors`).
+        """
+        if request.stream is None:
+            return Response({'error': 'Der Request enthält keine Angebote.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        importer = OfferBulkImporter(request.user, self.get_serializer_context(), chunk_size=self.bulk_chunk_size)
+        return StreamingHttpResponse(importer.run(request.stream), content_type='application/x-ndjson')
+
+    @action(detail=False, methods=['get'], url_path='export', renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Streamt alle Angebote (optional gefiltert) als NDJSON oder CSV.
+
+        Das Format wird über `format=ndjson|csv` oder den `Accept`-Header gewählt.
+        """
+        exporter = OfferCatalogExporter(
+            self.filter_queryset(self.get_queryset()),
+            self.get_serializer_context(),
+            chunk_size=self.export_chunk_size
         )
+        renderer = request.accepted_renderer
+        if isinstance(renderer, CSVRenderer):
+            rows, header = exporter.csv_rows(), OFFER_CSV_HEADER
+        else:
+            rows, header = exporter.ndjson_rows(), None
+
+        response = StreamingHttpResponse(renderer.stream(rows, header), content_type=renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="offers.{renderer.format}"'
+        return response
 
 
-class OfferDetailsViewSet(viewsets.ModelViewSet):
+class OfferDetailsViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet zur Verwaltung von Angebotsdetails.
 
@@ -158,12 +235,95 @@ class OfferDetailsViewSet(viewsets.ModelViewSet):
     - **PATCH**: Aktualisiert ein bestehendes Angebotsdetail.
     - **DELETE**: Entfernt ein Angebotsdetail.
 
+    Unterstützt bedingte GET-Anfragen; als Änderungszeitpunkt dient `updated_at` des Angebots.
+
     **Berechtigungen**:
     - Erfordert Authentifizierung.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = OfferDetailsSerializer
     queryset = OfferDetails.objects.all()
+    last_modified_field = 'offer__updated_at'
+
+
+class OrderEventsView(View):
+    """
+    Asynchroner Server-Sent-Events-Stream für Bestellereignisse des angemeldeten Benutzers.
+
+    **URL**: `/order-events/`
+
+    **Methoden**:
+    - **GET**: Öffnet einen `text/event-stream` mit den Ereignissen `order.created` und
+      `order.status_changed` für Bestellungen, an denen der Benutzer als Kunde oder Anbieter
+      beteiligt ist. Erfordert einen ASGI-Server (`coderr.asgi`).
+
+    **Berechtigungen**:
+    - DRF-Token im Header `Authorization: Token <key>` oder, da `EventSource` keine Header
+      setzen kann, ein einmal verwendbares Ticket als Parameter `?ticket=<ticket>`
+      (siehe `OrderEventTicketView`). Das dauerhafte API-Token wird im Query-String nicht
+      akzeptiert, damit es nicht in Zugriffsprotokollen oder im Browserverlauf landet.
+    """
+    heartbeat_interval = 15
+
+    async def get(self, request, *args, **kwargs):
+        user = await self.authenticate(request)
+        if user is None:
+            return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+        stream = order_events.OrderEventStream(order_events.broker.subscribe(user.id), self.heartbeat_interval)
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def authenticate(self, request):
+        """
+        Prüft das DRF-Token aus dem Header oder löst das Ticket aus `?ticket=` ein und gibt den Benutzer zurück.
+        """
+        header = request.headers.get('Authorization', '').split()
+        if len(header) != 2 or header[0].lower() != 'token':
+            ticket = request.GET.get('ticket')
+            return await sync_to_async(OrderEventTicket.objects.redeem)(ticket) if ticket else None
+        try:
+            user, _ = await sync_to_async(ProfileTokenAuthentication().authenticate_credentials)(header[1])
+        except AuthenticationFailed:
+            return None
+        return user
+
+
+class OrderEventTicketView(APIView):
+    """
+    API-Ansicht zum Ausstellen eines Tickets für den Ereignis-Stream.
+
+    **URL**: `/order-events/ticket/`
+
+    **Methoden**:
+    - **POST**: Gibt ein einmal verwendbares Ticket zurück, das `ORDER_EVENTS_TICKET_TTL`
+      Sekunden gültig ist und mit `/order-events/?ticket=<ticket>` eingelöst wird.
+
+    **Berechtigungen**:
+    - Erfordert Authentifizierung.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Stellt ein neues Ticket für den angemeldeten Benutzer aus.
+        """
+        ticket = OrderEventTicket.objects.issue(request.user)
+        return Response({'ticket': ticket.key, 'expires_in': settings.ORDER_EVENTS_TICKET_TTL}, status.HTTP_201_CREATED)
+
+
+class OrdersFilter(django_filters.FilterSet):
+    """
+    FilterSet zum Filtern von Bestellungen nach Status, Angebotstyp und Erstellungszeitraum.
+    """
+    created_at_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_at_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lte')
+
+    class Meta:
+        model = Orders
+        fields = ['status', 'offer_type', 'created_at_after', 'created_at_before']
 
 
 class OrdersViewSet(viewsets.ModelViewSet):
@@ -174,39 +334,89 @@ class OrdersViewSet(viewsets.ModelViewSet):
 
     **Methoden**:
     - **GET**: Listet alle Bestellungen auf, die mit dem authentifizierten Benutzer verbunden sind.
+      Die Liste ist cursor-paginiert (neueste zuerst) und kann nach `status`, `offer_type`
+      sowie `created_at_after`/`created_at_before` gefiltert werden.
+    - **GET** `/orders/{id}/`: Gibt eine Bestellung zurück; archivierte Bestellungen
+      (`OrdersArchive`) werden ebenfalls gefunden.
     - **POST**: Erstellt eine neue Bestellung.
     - **PATCH**: Aktualisiert eine bestehende Bestellung.
+    - **PATCH** `/orders/bulk-status/`: Setzt den Status mehrerer eigener Bestellungen
+      (`{"ids": [...], "status": "..."}`) und meldet übersprungene IDs mit Grund.
     - **DELETE**: Entfernt eine Bestellung.
 
+    Neue Bestellungen und Statusänderungen werden nach dem Commit über `OrderEventsView`
+    an Kunde und Anbieter gemeldet.
+
     **Berechtigungen**:
     - Benötigt benutzerdefinierte Berechtigungen für den Zugriff auf Bestellungen.
     """
     permission_classes = [OrderAccessPermission]
     serializer_class = OrdersSerializer
     queryset = Orders.objects.all()
+    pagination_class = OrdersCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OrdersFilter
 
     def get_queryset(self):
         """
         Gibt Bestellungen zurück, die mit dem authentifizierten Benutzer verbunden sind.
+
+        Die Feature-Snapshots werden per Join mitgeladen.
         """
-        user = self.request.user
+        return self.filter_for_user(Orders.objects.select_related('features_snapshot'))
+
+    def list(self, request, *args, **kwargs):
+        """
+        Listet die Bestellungen des Benutzers cursor-paginiert auf.
+
+        Statt einer Oder-Bedingung über Kunde und Anbieter (die SQLite nur über die einfachen
+        Fremdschlüssel-Indizes mit anschließender Sortierung auflöst) wird je Seite eine
+        Keyset-Abfrage ausgeführt, die den zusammengesetzten Index `(benutzer, created_at)`
+        nutzt. `OrdersCursorPagination` führt beide Seiten zusammen und entfernt doppelte
+        Bestellungen.
+        """
+        queryset = self.filter_queryset(Orders.objects.select_related('features_snapshot'))
+        user = request.user
         if user.user_profile.type == 'staff':
-            return Orders.objects.all()
+            querysets = [queryset]
         else:
-            customer_orders = Orders.objects.filter(customer_user=user)
-            business_orders = Orders.objects.filter(business_user=user)
-            return customer_orders | business_orders
+            querysets = [queryset.filter(customer_user=user), queryset.filter(business_user=user)]
+        page = self.paginator.paginate_querysets(querysets, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def filter_for_user(self, queryset):
+        """
+        Schränkt Bestellungen bzw. archivierte Bestellungen auf die des Benutzers ein.
+        """
+        user = self.request.user
+        if user.user_profile.type == 'staff':
+            return queryset
+        return queryset.filter(Q(customer_user=user) | Q(business_user=user))
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Gibt eine Bestellung zurück und sucht sie bei Bedarf im Archiv.
+        """
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            archived_order = generics.get_object_or_404(self.filter_for_user(OrdersArchive.objects.select_related('features_snapshot')), pk=kwargs['pk'])
+            return Response(OrdersArchiveSerializer(archived_order).data)
+
+    @transaction.atomic
     def perform_create(self, serializer):
         """
         Erstellt eine neue Bestellung mit Details und verknüpft sie mit dem Kunden und dem Geschäftsbenutzer.
 
-        Erfordert 'offer_detail_id' in den Anfragedaten.
+        Erfordert 'offer_detail_id' in den Anfragedaten. Angebotsdetail, Angebot und Anbieter
+        werden mit einer Abfrage geladen; die Bestellung und die Bestellzähler des Anbieters
+        werden in derselben Transaktion geschrieben.
         """
         offer_detail_id = self.request.data.get('offer_detail_id')
 
         try:
-            offer_detail = OfferDetails.objects.get(id=offer_detail_id)
+            offer_detail = OfferDetails.objects.select_related('offer__user').get(id=offer_detail_id)
             offer = offer_detail.offer
             customer_user = self.request.user
             business_user = offer.user
@@ -227,6 +437,50 @@ class OrdersViewSet(viewsets.ModelViewSet):
 
         except OfferDetails.DoesNotExist:
             raise ValueError('Invalid offer_detail_id')
+
+        order = serializer.data
+        transaction.on_commit(lambda: order_events.publish_order_created(order))
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """
+        Speichert die Bestellung und passt die Bestellzähler in derselben Transaktion an.
+
+        Eine Statusänderung wird nach dem Commit an Kunde und Anbieter gemeldet.
+        """
+        previous_status = serializer.instance.get_loaded_value('status')
+        order = serializer.save()
+        if order.status != previous_status:
+            transaction.on_commit(lambda: order_events.publish_order_status_changed(
+                order.id, order.customer_user_id, order.business_user_id, order.status, previous_status
+            ))
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """
+        Löscht die Bestellung und passt die Bestellzähler in derselben Transaktion an.
+        """
+        instance.delete()
+
+    @action(detail=False, methods=['patch'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """
+        Setzt den Status mehrerer Bestellungen mit einem einzigen `UPDATE`.
+        """
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data['status']
+        updater = OrderStatusBulkUpdater(request.user)
+        result = updater.run(serializer.validated_data['ids'], new_status)
+
+        def publish_events():
+            for order in updater.changed_orders:
+                order_events.publish_order_status_changed(
+                    order['id'], order['customer_user_id'], order['business_user_id'], new_status, order['status']
+                )
+
+        transaction.on_commit(publish_events)
+        return Response(result)
         
     def create(self, request, *args, **kwargs):
         """
@@ -238,6 +492,66 @@ class OrdersViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
 
+def parse_business_user_ids(request, max_ids):
+    """
+    Liest die kommagetrennten IDs aus `?business_user_ids=` (ohne Duplikate, Reihenfolge bleibt).
+
+    Gibt `(ids, None)` oder bei ungültiger Eingabe `(None, Response)` mit Status 400 zurück.
+    """
+    raw_ids = [value.strip() for value in request.query_params.get('business_user_ids', '').split(',') if value.strip()]
+    if not raw_ids:
+        return None, Response({'error': 'business_user_ids is required.'}, status.HTTP_400_BAD_REQUEST)
+    if not all(value.isdigit() for value in raw_ids):
+        return None, Response({'error': 'business_user_ids must be a comma separated list of IDs.'}, status.HTTP_400_BAD_REQUEST)
+
+    business_user_ids = list(dict.fromkeys(int(value) for value in raw_ids))
+    if len(business_user_ids) > max_ids:
+        return None, Response({'error': f'At most {max_ids} business_user_ids are allowed.'}, status.HTTP_400_BAD_REQUEST)
+    return business_user_ids, None
+
+
+def get_order_status_counts_bulk(business_user_ids):
+    """
+    Liest die Bestellzähler mehrerer Geschäftsbenutzer mit einer einzigen Abfrage.
+
+    Gibt ein Dictionary `{business_user_id: {status: anzahl}}` zurück, das nur IDs von
+    Geschäftsbenutzern enthält. Anbieter ohne Bestellungen haben noch keine Zählerzeile
+    und erhalten überall 0.
+    """
+    rows = User.objects.filter(id__in=business_user_ids, user_profile__type='business').values(
+        'id', *(f'order_status_counter__{status_name}' for status_name in OrderStatusCounter.STATUSES)
+    )
+    return {
+        row['id']: {status_name: row[f'order_status_counter__{status_name}'] or 0 for status_name in OrderStatusCounter.STATUSES}
+        for row in rows
+    }
+
+
+def get_order_status_counts(business_user_id):
+    """
+    Liest die Bestellzähler eines Geschäftsbenutzers mit einer einzigen Abfrage.
+
+    Fehlt die Zählerzeile (neuer Anbieter oder Import ohne Signale), berechnet sie per
+    `single_flight` genau ein Worker aus den Bestellungen; gleichzeitige Anfragen warten
+    kurz und übernehmen das Ergebnis. Gibt `None` zurück, wenn kein Geschäftsbenutzer mit
+    dieser ID existiert.
+    """
+    row = User.objects.filter(id=business_user_id, user_profile__type='business').values(
+        'order_status_counter', *(f'order_status_counter__{status_name}' for status_name in OrderStatusCounter.STATUSES)
+    ).first()
+    if row is None:
+        return None
+    if row['order_status_counter'] is not None:
+        return {status_name: row[f'order_status_counter__{status_name}'] for status_name in OrderStatusCounter.STATUSES}
+
+    counter = single_flight(
+        f'order-status-counter:{business_user_id}',
+        lambda: OrderStatusCounter.objects.rebuild_for(business_user_id),
+        lambda: OrderStatusCounter.objects.filter(business_user_id=business_user_id).first()
+    )
+    return {status_name: getattr(counter, status_name) for status_name in OrderStatusCounter.STATUSES}
+
+
 class InProgressOrderCountView(APIView):
     """
     API-Ansicht zur Zählung der laufenden Bestellungen für einen Geschäftsbenutzer.
@@ -256,15 +570,11 @@ class InProgressOrderCountView(APIView):
         """
         Erhält die Anzahl der laufenden Bestellungen für einen bestimmten Geschäftsbenutzer.
         """
-        if not User.objects.filter(id=business_user_id, user_profile__type='business').exists():
+        counts = get_order_status_counts(business_user_id)
+        if counts is None:
             return Response({'error': 'Business user not found.'}, status.HTTP_400_BAD_REQUEST)
 
-        in_progress_count = Orders.objects.filter(
-            business_user_id=business_user_id,
-            status='in_progress'
-        ).count()
-
-        return Response({'order_count': in_progress_count})
+        return Response({'order_count': counts['in_progress']})
     
 
 class CompletedOrderCountView(APIView):
@@ -285,16 +595,112 @@ class CompletedOrderCountView(APIView):
         """
         Erhält die Anzahl der abgeschlossenen Bestellungen für einen bestimmten Geschäftsbenutzer.
         """
+        counts = get_order_status_counts(business_user_id)
+        if counts is None:
+            return Response({'error': 'Business user not found.'}, status.HTTP_400_BAD_REQUEST)
+
+        return Response({'completed_order_count': counts['completed']})
+    
+
+class OrderCountsView(APIView):
+    """
+    API-Ansicht zur Abfrage der Bestellzähler vieler Geschäftsbenutzer in einer Anfrage.
+
+    **URL**: `/order-counts/?business_user_ids=1,2,3`
+
+    **Methoden**:
+    - **GET**: Gibt je Geschäftsbenutzer `order_count` (laufend) und `completed_order_count`
+      zurück. Es werden höchstens `max_ids` IDs angenommen; alle IDs müssen zu
+      Geschäftsbenutzern gehören.
+
+    **Berechtigungen**:
+    - Erfordert Authentifizierung.
+    """
+    permission_classes = [IsAuthenticated]
+    max_ids = 500
+
+    def get(self, request, *args, **kwargs):
+        """
+        Erhält die Anzahl der laufenden und abgeschlossenen Bestellungen der angegebenen Geschäftsbenutzer.
+        """
+        business_user_ids, error = parse_business_user_ids(request, self.max_ids)
+        if error:
+            return error
+
+        counts = get_order_status_counts_bulk(business_user_ids)
+        missing_ids = [business_user_id for business_user_id in business_user_ids if business_user_id not in counts]
+        if missing_ids:
+            return Response({'error': 'Business user not found.', 'business_user_ids': missing_ids}, status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            str(business_user_id): {
+                'order_count': counts[business_user_id]['in_progress'],
+                'completed_order_count': counts[business_user_id]['completed'],
+            }
+            for business_user_id in business_user_ids
+        })
+
+
+class BusinessRevenueView(APIView):
+    """
+    API-Ansicht für Bestellanzahl und Umsatz eines Geschäftsbenutzers je Zeitraum und Status.
+
+    **URL**: `/businesses/{business_user_id}/revenue/?granularity=day|month&from=&to=`
+
+    **Methoden**:
+    - **GET**: Gibt die Umsatz-Rollups je Tag (`day`, Standard) oder Monat (`month`) zurück.
+      `from` und `to` (`YYYY-MM-DD`) begrenzen den Zeitraum inklusive.
+
+    **Berechtigungen**:
+    - Nur der Geschäftsbenutzer selbst oder Administratoren.
+    """
+    permission_classes = [BusinessOwnerOrAdminPermission]
+    GRANULARITIES = {
+        'day': (F('day'), '%Y-%m-%d'),
+        'month': (TruncMonth('day'), '%Y-%m'),
+    }
+
+    def get(self, request, business_user_id, *args, **kwargs):
+        """
+        Erhält die nach Zeitraum und Status gruppierten Umsätze aus den vorberechneten Rollups.
+        """
+        granularity = request.query_params.get('granularity', 'day')
+        if granularity not in self.GRANULARITIES:
+            return Response({'error': 'granularity must be "day" or "month".'}, status.HTTP_400_BAD_REQUEST)
+
+        rollups = RevenueRollup.objects.filter(business_user_id=business_user_id)
+        for param, lookup in (('from', 'day__gte'), ('to', 'day__lte')):
+            if param in request.query_params:
+                try:
+                    day = parse_date(request.query_params[param])
+                except ValueError:
+                    day = None
+                if day is None:
+                    return Response({'error': f'{param} must be a date (YYYY-MM-DD).'}, status.HTTP_400_BAD_REQUEST)
+                rollups = rollups.filter(**{lookup: day})
+
         if not User.objects.filter(id=business_user_id, user_profile__type='business').exists():
             return Response({'error': 'Business user not found.'}, status.HTTP_400_BAD_REQUEST)
 
-        completed_count = Orders.objects.filter(
-            business_user_id=business_user_id,
-            status='completed'
-        ).count()
+        period, period_format = self.GRANULARITIES[granularity]
+        rows = rollups.order_by().values('status', period=period).annotate(
+            order_count=Sum('order_count'), revenue=Sum('price_sum')
+        ).order_by('period', 'status')
+
+        return Response({
+            'business_user_id': business_user_id,
+            'granularity': granularity,
+            'results': [
+                {
+                    'period': row['period'].strftime(period_format),
+                    'status': row['status'],
+                    'order_count': row['order_count'],
+                    'revenue': f'{row["revenue"]:.2f}',
+                }
+                for row in rows
+            ],
+        })
 
-        return Response({'completed_order_count': completed_count})
-    
 
 class ReviewsFilter(django_filters.FilterSet):
     """
@@ -321,7 +727,10 @@ class ReviewsViewSet(viewsets.ModelViewSet):
     **URL**: `/reviews/`
 
     **Methoden**:
-    - **GET**: Listet alle Bewertungen auf, optional gefiltert nach Geschäftsbenutzer oder Rezensenten.
+    - **GET**: Listet Bewertungen cursor-paginiert auf, optional gefiltert nach Geschäftsbenutzer oder
+      Rezensenten und sortiert nach `updated_at` oder `rating` (jeweils mit `id` als Tie-Breaker).
+    - **GET** `/reviews/top/?business_user_ids=1,2&limit=3&ordering=-rating`: Gibt je Geschäftsbenutzer
+      die ersten `limit` Bewertungen zurück (eine Abfrage für alle Geschäftsbenutzer).
     - **POST**: Erstellt eine neue Bewertung.
     - **DELETE**: Löscht eine bestehende Bewertung.
 
@@ -331,19 +740,69 @@ class ReviewsViewSet(viewsets.ModelViewSet):
     permission_classes = [IsReviewerOrAdminPermission]
     serializer_class = ReviewsSerializer
     queryset = Reviews.objects.all()
+    pagination_class = ReviewsCursorPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = ReviewsFilter
     ordering_fields = ['updated_at', 'rating']
     ordering = ['-updated_at']
+    top_default_limit = 3
+    top_max_limit = 10
+    top_max_ids = 100
 
+    @action(detail=False, methods=['get'], url_path='top')
+    def top(self, request):
+        """
+        Gibt je Geschäftsbenutzer die ersten `limit` Bewertungen in der gewählten Sortierung zurück.
+
+        Alle Geschäftsbenutzer werden mit einer einzigen Fensterabfrage (`ROW_NUMBER()`) geladen;
+        Geschäftsbenutzer ohne Bewertungen erhalten eine leere Liste.
+        """
+        business_user_ids, error = parse_business_user_ids(request, self.top_max_ids)
+        if error:
+            return error
+
+        ordering = request.query_params.get('ordering', '-updated_at')
+        if ordering not in Reviews.objects.TOP_ORDERINGS:
+            return Response({'error': f'ordering must be one of {", ".join(Reviews.objects.TOP_ORDERINGS)}.'}, status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', self.top_default_limit))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.top_max_limit:
+            return Response({'error': f'limit must be between 1 and {self.top_max_limit}.'}, status.HTTP_400_BAD_REQUEST)
+
+        top_reviews = {business_user_id: [] for business_user_id in business_user_ids}
+        for review in Reviews.objects.top_per_business(business_user_ids, limit, ordering):
+            top_reviews[review.business_user_id].append(review)
+        return Response({
+            str(business_user_id): self.get_serializer(reviews, many=True).data
+            for business_user_id, reviews in top_reviews.items()
+        })
+
+    @transaction.atomic
     def perform_create(self, serializer):
         """
         Erstellt eine neue Bewertung und verknüpft sie mit dem authentifizierten Benutzer.
 
-        Der Benutzer wird als `customer_user` gespeichert.
+        Der Benutzer wird als `customer_user` gespeichert. Die Bewertungsübersicht des
+        Anbieters wird in derselben Transaktion angepasst.
         """
         serializer.save(customer_user=self.request.user)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """
+        Speichert die Bewertung und passt die Bewertungsübersicht in derselben Transaktion an.
+        """
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """
+        Löscht die Bewertung und passt die Bewertungsübersicht in derselben Transaktion an.
+        """
+        instance.delete()
+
     def destroy(self, request, *args, **kwargs):
         """
         Löscht die angegebene Bewertung und gibt eine leere Antwort mit dem Status 200 zurück.
@@ -361,6 +820,8 @@ class BaseInfoView(generics.ListAPIView):
 
     **Methoden**:
     - **GET**: Gibt grundlegende Statistiken über Benutzerprofile, Bewertungen und Angebote zurück.
+      Die Werte stammen aus der laufend gepflegten Zeile `PlatformStats` (eine Abfrage); fehlt
+      sie, baut sie per `single_flight` genau ein Worker neu auf.
 
     **Antwort**:
     - Anzahl der Geschäftprofile
@@ -371,19 +832,6 @@ class BaseInfoView(generics.ListAPIView):
     queryset = UserProfile.objects.all()
     serializer_class = UserProfile
 
-    def _calculate_average_rating(self):
-        """
-        Berechnet die durchschnittliche Bewertung aller Bewertungen.
-
-        Gibt 0 zurück, wenn keine Bewertungen vorhanden sind.
-        """
-        ratings = Reviews.objects.values_list('rating', flat=True)
-        total_ratings = ratings.count()
-        if total_ratings == 0:
-            return 0
-        
-        return round(sum(ratings) / total_ratings, 1)
-
     def list(self, request):
         """
         Gibt eine Zusammenfassung der Basisinformationen zurück:
@@ -392,14 +840,11 @@ class BaseInfoView(generics.ListAPIView):
         - Anzahl der Angebote
         - Durchschnittliche Bewertung
         """
-        business_profile_count = UserProfile.objects.filter(type='business').count()
-        review_count = Reviews.objects.count()
-        offer_count = Offers.objects.count()
-        average_rating = self._calculate_average_rating()
+        stats = single_flight('platform-stats', PlatformStats.objects.rebuild, PlatformStats.objects.get_current)
 
         return Response({
-            'business_profile_count': business_profile_count,
-            'review_count': review_count,
-            'offer_count': offer_count,
-            'average_rating': average_rating
-        })
\ No newline at end of file
+            'business_profile_count': stats.business_profile_count,
+            'review_count': stats.review_count,
+            'offer_count': stats.offer_count,
+            'average_rating': stats.average_rating
+        })
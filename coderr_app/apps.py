@@ -1,5 +1,5 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_save, post_delete
 
 
 class CoderrAppConfig(AppConfig):
@@ -11,6 +11,50 @@ class CoderrAppConfig(AppConfig):
         """
         Registriert das `create_guest_accounts` Signal mit dem `post_migrate` Ereignis,
         sodass nach jeder Migration automatisch Gast-Accounts erstellt werden.
+
+        Verbindet außerdem `update_offer_aggregates` mit `post_save` und `post_delete`
+        von `OfferDetails`, damit die Kennzahlen der Angebote aktuell bleiben, die
+        Signale zur Invalidierung des Angebotscaches sowie die Pflege der Bestellzähler,
+        Umsatz-Rollups, der Plattformstatistik und der Bewertungsübersichten.
         """
-        from .signals import create_guest_accounts
-        post_migrate.connect(create_guest_accounts, sender=self)
\ No newline at end of file
+        from django.contrib.auth.models import User
+        from .models import UserProfile, Offers, OfferDetails, Orders, Reviews, offer_aggregates_changed
+        from .signals import (
+            create_guest_accounts, update_offer_aggregates, invalidate_offer_cache_on_save,
+            invalidate_offer_cache_on_delete, invalidate_offer_detail_cache,
+            invalidate_catalog_on_aggregates_changed, invalidate_user_offers_cache,
+            touch_user_related_objects, update_order_status_counters, decrement_order_status_counters,
+            update_revenue_rollups, decrement_revenue_rollups, remember_loaded_values,
+            update_platform_stats_on_profile_save, update_platform_stats_on_profile_delete,
+            update_platform_stats_on_review_save, update_platform_stats_on_review_delete,
+            update_platform_stats_on_offer_save, update_platform_stats_on_offer_delete,
+            update_rating_summary_on_review_save, update_rating_summary_on_review_delete
+        )
+        post_migrate.connect(create_guest_accounts, sender=self)
+        post_save.connect(update_offer_aggregates, sender=OfferDetails)
+        post_delete.connect(update_offer_aggregates, sender=OfferDetails)
+
+        post_save.connect(invalidate_offer_cache_on_save, sender=Offers)
+        post_delete.connect(invalidate_offer_cache_on_delete, sender=Offers)
+        post_save.connect(invalidate_offer_detail_cache, sender=OfferDetails)
+        post_delete.connect(invalidate_offer_detail_cache, sender=OfferDetails)
+        offer_aggregates_changed.connect(invalidate_catalog_on_aggregates_changed, sender=Offers)
+        post_save.connect(invalidate_user_offers_cache, sender=User)
+        post_save.connect(touch_user_related_objects, sender=User)
+
+        post_save.connect(update_order_status_counters, sender=Orders)
+        post_save.connect(update_revenue_rollups, sender=Orders)
+        post_save.connect(remember_loaded_values, sender=Orders)
+        post_delete.connect(decrement_order_status_counters, sender=Orders)
+        post_delete.connect(decrement_revenue_rollups, sender=Orders)
+
+        post_save.connect(update_platform_stats_on_profile_save, sender=UserProfile)
+        post_save.connect(remember_loaded_values, sender=UserProfile)
+        post_delete.connect(update_platform_stats_on_profile_delete, sender=UserProfile)
+        post_save.connect(update_platform_stats_on_review_save, sender=Reviews)
+        post_save.connect(update_rating_summary_on_review_save, sender=Reviews)
+        post_save.connect(remember_loaded_values, sender=Reviews)
+        post_delete.connect(update_platform_stats_on_review_delete, sender=Reviews)
+        post_delete.connect(update_rating_summary_on_review_delete, sender=Reviews)
+        post_save.connect(update_platform_stats_on_offer_save, sender=Offers)
+        post_delete.connect(update_platform_stats_on_offer_delete, sender=Offers)
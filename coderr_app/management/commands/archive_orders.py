@@ -0,0 +1,35 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from coderr_app.models import OrdersArchive
+
+
+class Command(BaseCommand):
+    """
+    Verschiebt abgeschlossene oder stornierte Bestellungen in das Archiv (`OrdersArchive`).
+
+    Jeder Block wird in einer eigenen Transaktion verschoben, sodass der Befehl jederzeit
+    abgebrochen und erneut gestartet werden kann.
+
+    **Aufruf**:
+    - `python manage.py archive_orders`: Nutzt `ORDERS_ARCHIVE_AFTER_DAYS` aus den Einstellungen.
+    - `python manage.py archive_orders --days 90 --batch-size 1000`
+    """
+    help = 'Verschiebt abgeschlossene oder stornierte Bestellungen ab einem Mindestalter ins Archiv.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ORDERS_ARCHIVE_AFTER_DAYS, help='Mindestalter seit der letzten Änderung in Tagen.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Anzahl Bestellungen pro Transaktion.')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        total = 0
+        while True:
+            archived = OrdersArchive.objects.archive_batch(before, options['batch_size'])
+            if not archived:
+                break
+            total += archived
+            self.stdout.write(f'{total} Bestellung(en) archiviert ...')
+
+        self.stdout.write(self.style.SUCCESS(f'{total} Bestellung(en) ins Archiv verschoben.'))
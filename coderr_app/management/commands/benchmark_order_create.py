@@ -0,0 +1,128 @@
+import statistics
+import threading
+import time
+import uuid
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from coderr_app.models import UserProfile, Offers, OfferDetails
+
+
+class Command(BaseCommand):
+    """
+    Misst den Durchsatz von `POST /api/orders/` bei gleichzeitigen Anfragen.
+
+    Legt einen temporären Anbieter mit Angebot sowie je Thread einen Kunden an, sendet
+    die Anfragen über den DRF-Testclient und entfernt die Testdaten anschließend wieder,
+    auch bei einem Abbruch (Strg+C) oder Fehler.
+
+    Gemessen wird gegen eine separate SQLite-Datei (`--database`, wird bei Bedarf angelegt
+    und migriert). Gegen die konfigurierte Datenbank läuft der Benchmark nur mit
+    `--allow-live-db`.
+
+    **Aufruf**:
+    - `python manage.py benchmark_order_create --database /tmp/bench.sqlite3 --requests 500 --threads 8`
+    """
+    help = 'Misst Bestellungen pro Sekunde bei gleichzeitigen POST-Anfragen auf /api/orders/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Anzahl der Bestellungen insgesamt.')
+        parser.add_argument('--threads', type=int, default=4, help='Anzahl gleichzeitiger Clients.')
+        parser.add_argument('--database', help='Pfad einer separaten SQLite-Datei für den Benchmark.')
+        parser.add_argument('--allow-live-db', action='store_true', help='Erlaubt den Benchmark gegen die konfigurierte Datenbank.')
+
+    def handle(self, *args, **options):
+        if options['database']:
+            self.use_scratch_database(options['database'])
+        elif not options['allow_live_db']:
+            raise CommandError('Der Benchmark schreibt Testdaten. Gib mit --database eine separate SQLite-Datei an oder bestätige mit --allow-live-db.')
+
+        total, threads = options['requests'], max(1, options['threads'])
+        prefix = f'bench-{uuid.uuid4().hex[:8]}'
+        latencies, failures = [], []
+        lock = threading.Lock()
+        stop = threading.Event()
+        workers = []
+        url = reverse('orders-list')
+
+        def worker(token, count, detail_id):
+            client = APIClient(SERVER_NAME='127.0.0.1')
+            client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+            try:
+                for _ in range(count):
+                    if stop.is_set():
+                        break
+                    started = time.perf_counter()
+                    try:
+                        response = client.post(url, {'offer_detail_id': detail_id}, format='json')
+                        result = response.status_code
+                    except Exception as error:
+                        result = type(error).__name__
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        if result == 201:
+                            latencies.append(elapsed)
+                        else:
+                            failures.append(result)
+            finally:
+                connections.close_all()
+
+        try:
+            business, detail_id, tokens = self.create_fixtures(prefix, threads)
+            counts = [total // threads + (1 if i < total % threads else 0) for i in range(threads)]
+            workers = [threading.Thread(target=worker, args=(token, count, detail_id)) for token, count in zip(tokens, counts)]
+            started = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            duration = time.perf_counter() - started
+        finally:
+            stop.set()
+            for thread in workers:
+                if thread.is_alive():
+                    thread.join()
+            User.objects.filter(username__startswith=prefix).delete()
+
+        self.stdout.write(f'Datenbank: {connection.vendor}, Threads: {threads}, Anfragen: {total}')
+        self.stdout.write(f'Erfolgreich: {len(latencies)}, Fehlgeschlagen: {len(failures)}')
+        for failure in sorted(set(map(str, failures))):
+            self.stdout.write(self.style.WARNING(f'  {failure}: {sum(str(item) == failure for item in failures)}'))
+        if latencies:
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(f'Latenz p50: {statistics.median(latencies) * 1000:.1f} ms, p95: {p95 * 1000:.1f} ms')
+        self.stdout.write(self.style.SUCCESS(f'{len(latencies) / duration:.1f} Bestellungen/s'))
+
+    def use_scratch_database(self, path):
+        """
+        Richtet die Standardverbindung auf die SQLite-Datei `path` aus und migriert sie.
+        """
+        if connection.vendor != 'sqlite':
+            raise CommandError('--database wird nur für SQLite unterstützt.')
+        connections.close_all()
+        connections.settings[DEFAULT_DB_ALIAS]['NAME'] = path
+        call_command('migrate', verbosity=0, interactive=False)
+
+    def create_fixtures(self, prefix, threads):
+        """
+        Legt Anbieter, Angebot mit Detail und je Thread einen Kunden mit Token an.
+        """
+        business = User.objects.create(username=f'{prefix}-business')
+        UserProfile.objects.create(user=business, email='business@bench.local', type='business')
+        offer = Offers.objects.create(user=business, title='Benchmark', description='Benchmark')
+        detail = OfferDetails.objects.create(
+            offer=offer, title='Benchmark', revisions=1, delivery_time_in_days=1,
+            price=10, features=['Benchmark'], offer_type='basic'
+        )
+
+        tokens = []
+        for index in range(threads):
+            customer = User.objects.create(username=f'{prefix}-customer-{index}')
+            UserProfile.objects.create(user=customer, email='customer@bench.local', type='customer')
+            tokens.append(Token.objects.create(user=customer).key)
+        return business, detail.id, tokens
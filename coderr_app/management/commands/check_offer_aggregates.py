@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Min, Max, Subquery, OuterRef
+from coderr_app.models import Offers, OfferDetails
+
+
+class Command(BaseCommand):
+    """
+    Vergleicht die gespeicherten Kennzahlen der Angebote mit den tatsächlichen Werten
+    der Angebotsdetails.
+
+    **Aufruf**:
+    - `python manage.py check_offer_aggregates`: Listet alle abweichenden Angebote auf.
+    - `python manage.py check_offer_aggregates --fix`: Korrigiert abweichende Angebote.
+    """
+    help = 'Prüft min_price, min_delivery_time und max_delivery_time der Angebote gegen die Angebotsdetails.'
+
+    FIELDS = {
+        'min_price': Min('price'),
+        'min_delivery_time': Min('delivery_time_in_days'),
+        'max_delivery_time': Max('delivery_time_in_days'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Korrigiert abweichende Werte.')
+
+    def handle(self, *args, **options):
+        offers = Offers.objects.order_by('pk').values('pk', *self.FIELDS).annotate(**{
+            f'actual_{field}': Subquery(
+                OfferDetails.objects.filter(offer=OuterRef('pk')).values('offer').annotate(value=aggregate).values('value')
+            )
+            for field, aggregate in self.FIELDS.items()
+        })
+
+        mismatches = 0
+        for offer in offers.iterator(chunk_size=500):
+            differences = {
+                field: (offer[field], offer[f'actual_{field}'])
+                for field in self.FIELDS
+                if offer[field] != offer[f'actual_{field}']
+            }
+            if not differences:
+                continue
+
+            mismatches += 1
+            details = ', '.join(f'{field}: {stored} != {actual}' for field, (stored, actual) in differences.items())
+            self.stdout.write(f'Offer {offer["pk"]}: {details}')
+            if options['fix']:
+                Offers.objects.update_aggregates(offer['pk'])
+
+        if mismatches == 0:
+            self.stdout.write(self.style.SUCCESS('Alle Kennzahlen sind korrekt.'))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f'{mismatches} Angebot(e) korrigiert.'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{mismatches} Angebot(e) mit abweichenden Kennzahlen.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from coderr_app.models import OrderStatusCounter
+
+
+class Command(BaseCommand):
+    """
+    Baut die Bestellzähler der Anbieter aus der Tabelle `Orders` neu auf.
+
+    **Aufruf**:
+    - `python manage.py rebuild_order_status_counters`
+    """
+    help = 'Baut die Bestellzähler (in_progress, completed, cancelled) aller Anbieter neu auf.'
+
+    def handle(self, *args, **options):
+        count = OrderStatusCounter.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{count} Bestellzähler neu aufgebaut.'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from coderr_app.models import PlatformStats
+
+
+class Command(BaseCommand):
+    """
+    Berechnet die Plattformstatistik für `/base-info/` neu.
+
+    **Aufruf**:
+    - `python manage.py rebuild_platform_stats`
+    """
+    help = 'Berechnet Anzahl der Geschäftsprofile, Bewertungen, Angebote und die Durchschnittsbewertung neu.'
+
+    def handle(self, *args, **options):
+        stats = PlatformStats.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Geschäftsprofile: {stats.business_profile_count}, Bewertungen: {stats.review_count}, '
+            f'Angebote: {stats.offer_count}, Durchschnitt: {stats.average_rating}'
+        ))
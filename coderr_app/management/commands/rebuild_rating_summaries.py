@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from coderr_app.models import BusinessRatingSummary
+
+
+class Command(BaseCommand):
+    """
+    Baut die Bewertungsübersichten der Anbieter aus der Tabelle `Reviews` neu auf.
+
+    **Aufruf**:
+    - `python manage.py rebuild_rating_summaries`
+    """
+    help = 'Baut Anzahl, Durchschnitt und Sterne-Histogramm der Bewertungen aller Anbieter neu auf.'
+
+    def handle(self, *args, **options):
+        count = BusinessRatingSummary.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{count} Bewertungsübersichten neu aufgebaut.'))
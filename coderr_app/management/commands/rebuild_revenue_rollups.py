@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from coderr_app.models import RevenueRollup
+
+
+class Command(BaseCommand):
+    """
+    Baut die Umsatz-Rollups der Anbieter aus `Orders` und `OrdersArchive` neu auf.
+
+    **Aufruf**:
+    - `python manage.py rebuild_revenue_rollups`
+    - `python manage.py rebuild_revenue_rollups --chunk-size 10000`
+    """
+    help = 'Baut die Umsatz-Rollups (Anbieter, Tag, Status) blockweise aus der Bestellhistorie neu auf.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Anzahl Bestellungen pro Block.')
+
+    def handle(self, *args, **options):
+        count = RevenueRollup.objects.rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count} Umsatz-Rollup(s) neu aufgebaut.'))
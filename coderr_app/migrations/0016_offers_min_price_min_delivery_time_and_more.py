@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0015_alter_userprofile_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offers',
+            name='max_delivery_time',
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offers',
+            name='min_delivery_time',
+            field=models.PositiveIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offers',
+            name='min_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=10, null=True),
+        ),
+    ]
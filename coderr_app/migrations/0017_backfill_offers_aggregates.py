@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import Min, Max
+
+
+BATCH_SIZE = 500
+
+
+def backfill_offer_aggregates(apps, schema_editor):
+    """
+    Befüllt die Kennzahlen bestehender Angebote aus ihren Angebotsdetails.
+    """
+    Offers = apps.get_model('coderr_app', 'Offers')
+    OfferDetails = apps.get_model('coderr_app', 'OfferDetails')
+
+    offer_ids = list(Offers.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(offer_ids), BATCH_SIZE):
+        batch_ids = offer_ids[start:start + BATCH_SIZE]
+        aggregates = {
+            row['offer']: row for row in OfferDetails.objects.filter(offer__in=batch_ids).values('offer').annotate(
+                min_price=Min('price'),
+                min_delivery_time=Min('delivery_time_in_days'),
+                max_delivery_time=Max('delivery_time_in_days')
+            )
+        }
+        offers = list(Offers.objects.filter(pk__in=batch_ids))
+        for offer in offers:
+            row = aggregates.get(offer.pk, {})
+            offer.min_price = row.get('min_price')
+            offer.min_delivery_time = row.get('min_delivery_time')
+            offer.max_delivery_time = row.get('max_delivery_time')
+        Offers.objects.bulk_update(offers, ['min_price', 'min_delivery_time', 'max_delivery_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0016_offers_min_price_min_delivery_time_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_offer_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS coderr_app_offers_fts USING fts5(
+        title, description,
+        content='coderr_app_offers', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS coderr_app_offers_fts_insert AFTER INSERT ON coderr_app_offers BEGIN
+        INSERT INTO coderr_app_offers_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS coderr_app_offers_fts_delete AFTER DELETE ON coderr_app_offers BEGIN
+        INSERT INTO coderr_app_offers_fts(coderr_app_offers_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS coderr_app_offers_fts_update AFTER UPDATE OF title, description ON coderr_app_offers BEGIN
+        INSERT INTO coderr_app_offers_fts(coderr_app_offers_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO coderr_app_offers_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO coderr_app_offers_fts(coderr_app_offers_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS coderr_app_offers_fts_update',
+    'DROP TRIGGER IF EXISTS coderr_app_offers_fts_delete',
+    'DROP TRIGGER IF EXISTS coderr_app_offers_fts_insert',
+    'DROP TABLE IF EXISTS coderr_app_offers_fts',
+]
+
+
+def create_offers_fts(apps, schema_editor):
+    """
+    Legt den FTS5-Index für Titel und Beschreibung der Angebote samt Triggern an.
+
+    Nur für SQLite; andere Datenbanken nutzen weiterhin die `LIKE`-Suche.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_offers_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0017_backfill_offers_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_offers_fts, drop_offers_fts),
+    ]
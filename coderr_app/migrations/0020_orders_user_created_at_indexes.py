@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0019_userprofile_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orders',
+            index=models.Index(fields=['customer_user', 'created_at'], name='orders_customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orders',
+            index=models.Index(fields=['business_user', 'created_at'], name='orders_business_created_idx'),
+        ),
+    ]
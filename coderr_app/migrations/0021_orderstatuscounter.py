@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('coderr_app', '0020_orders_user_created_at_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusCounter',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_status_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Order Status Counters',
+            },
+        ),
+    ]
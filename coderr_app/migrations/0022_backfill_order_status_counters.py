@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+STATUSES = ('in_progress', 'completed', 'cancelled')
+
+
+def backfill_order_status_counters(apps, schema_editor):
+    """
+    Befüllt die Bestellzähler der Anbieter aus den bestehenden Bestellungen.
+    """
+    Orders = apps.get_model('coderr_app', 'Orders')
+    OrderStatusCounter = apps.get_model('coderr_app', 'OrderStatusCounter')
+
+    counters = {}
+    rows = Orders.objects.filter(status__in=STATUSES).order_by().values('business_user', 'status').annotate(count=Count('id'))
+    for row in rows:
+        counter = counters.setdefault(row['business_user'], OrderStatusCounter(business_user_id=row['business_user']))
+        setattr(counter, row['status'], row['count'])
+    OrderStatusCounter.objects.bulk_create(counters.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0021_orderstatuscounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_order_status_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0022_backfill_order_status_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrdersArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=150)),
+                ('revisions', models.IntegerField()),
+                ('delivery_time_in_days', models.PositiveIntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('features', models.JSONField()),
+                ('offer_type', models.CharField(max_length=50)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('status', models.CharField(max_length=25)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_business_orders', to=settings.AUTH_USER_MODEL)),
+                ('customer_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_customer_orders', to=settings.AUTH_USER_MODEL)),
+                ('offer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_orders', to='coderr_app.offers')),
+                ('offer_details', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_orders', to='coderr_app.offerdetails')),
+            ],
+            options={
+                'verbose_name_plural': 'Orders Archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_revenue_rollups(apps, schema_editor):
+    """
+    Befüllt die Umsatz-Rollups aus den bestehenden und archivierten Bestellungen.
+    """
+    RevenueRollup = apps.get_model('coderr_app', 'RevenueRollup')
+
+    rollups = {}
+    for model_name in ('Orders', 'OrdersArchive'):
+        model = apps.get_model('coderr_app', model_name)
+        rows = model.objects.order_by().values('business_user', 'status', day=TruncDate('created_at')).annotate(
+            order_count=Count('id'), price_sum=Sum('price')
+        )
+        for row in rows:
+            key = (row['business_user'], row['day'], row['status'])
+            rollup = rollups.setdefault(key, RevenueRollup(business_user_id=key[0], day=key[1], status=key[2], order_count=0, price_sum=0))
+            rollup.order_count += row['order_count']
+            rollup.price_sum += row['price_sum']
+    RevenueRollup.objects.bulk_create(rollups.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0024_revenuerollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_revenue_rollups, migrations.RunPython.noop),
+    ]
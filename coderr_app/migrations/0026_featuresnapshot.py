@@ -0,0 +1,33 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0025_backfill_revenue_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('features', models.JSONField()),
+            ],
+            options={
+                'verbose_name_plural': 'Feature Snapshots',
+            },
+        ),
+        migrations.AddField(
+            model_name='orders',
+            name='features_snapshot',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='coderr_app.featuresnapshot'),
+        ),
+        migrations.AddField(
+            model_name='ordersarchive',
+            name='features_snapshot',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_orders', to='coderr_app.featuresnapshot'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import logging
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_json(features):
+    return json.dumps(features, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def dedup_order_features(apps, schema_editor):
+    """
+    Ersetzt die kopierten Feature-Listen der Bestellungen blockweise durch Verweise auf
+    inhaltsadressierte Snapshots und protokolliert die eingesparten Bytes.
+
+    Die Einsparung bezieht sich auf die JSON-Daten; die Datei selbst schrumpft in SQLite
+    erst nach einem `VACUUM`.
+    """
+    FeatureSnapshot = apps.get_model('coderr_app', 'FeatureSnapshot')
+    bytes_before = bytes_after = 0
+    snapshot_ids = dict(FeatureSnapshot.objects.values_list('digest', 'id'))
+
+    for model_name in ('Orders', 'OrdersArchive'):
+        model = apps.get_model('coderr_app', model_name)
+        last_id = 0
+        while True:
+            rows = list(model.objects.filter(id__gt=last_id).order_by('id').values('id', 'features')[:BATCH_SIZE])
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            new_snapshots = {}
+            for row in rows:
+                canonical = canonical_json(row['features'])
+                bytes_before += len(canonical.encode('utf-8'))
+                row['digest'] = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+                if row['digest'] not in snapshot_ids and row['digest'] not in new_snapshots:
+                    new_snapshots[row['digest']] = FeatureSnapshot(digest=row['digest'], features=row['features'])
+                    bytes_after += len(canonical.encode('utf-8'))
+            FeatureSnapshot.objects.bulk_create(new_snapshots.values())
+            snapshot_ids.update(FeatureSnapshot.objects.filter(digest__in=new_snapshots).values_list('digest', 'id'))
+
+            model.objects.bulk_update(
+                [model(id=row['id'], features_snapshot_id=snapshot_ids[row['digest']]) for row in rows],
+                ['features_snapshot']
+            )
+
+    if bytes_before:
+        logger.info(
+            'Feature-Snapshots: %s Bytes in %s Snapshots auf %s Bytes reduziert, %s Bytes eingespart.',
+            bytes_before, len(snapshot_ids), bytes_after, bytes_before - bytes_after
+        )
+
+
+def restore_order_features(apps, schema_editor):
+    """
+    Kopiert beim Zurückrollen die Feature-Listen aus den Snapshots zurück in `features`.
+    """
+    FeatureSnapshot = apps.get_model('coderr_app', 'FeatureSnapshot')
+    snapshot_features = FeatureSnapshot.objects.filter(id=OuterRef('features_snapshot_id')).values('features')[:1]
+    for model_name in ('Orders', 'OrdersArchive'):
+        model = apps.get_model('coderr_app', model_name)
+        model.objects.filter(features_snapshot__isnull=False).update(features=Subquery(snapshot_features))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0026_featuresnapshot'),
+    ]
+
+    # `features` wird vorab nullbar, damit 0028 die Spalte beim Zurückrollen ohne Wert
+    # wieder anlegen kann; `restore_order_features` füllt sie, bevor sie wieder Pflicht wird.
+    operations = [
+        migrations.AlterField(
+            model_name='orders',
+            name='features',
+            field=models.JSONField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='ordersarchive',
+            name='features',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(dedup_order_features, restore_order_features),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0027_dedup_order_features'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='orders',
+            name='features',
+        ),
+        migrations.RemoveField(
+            model_name='ordersarchive',
+            name='features',
+        ),
+        migrations.AlterField(
+            model_name='orders',
+            name='features_snapshot',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='coderr_app.featuresnapshot'),
+        ),
+        migrations.AlterField(
+            model_name='ordersarchive',
+            name='features_snapshot',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_orders', to='coderr_app.featuresnapshot'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0028_remove_orders_features'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Platform Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_platform_stats(apps, schema_editor):
+    """
+    Legt die Statistikzeile für `/base-info/` aus dem aktuellen Datenbestand an.
+    """
+    PlatformStats = apps.get_model('coderr_app', 'PlatformStats')
+    UserProfile = apps.get_model('coderr_app', 'UserProfile')
+    Reviews = apps.get_model('coderr_app', 'Reviews')
+    Offers = apps.get_model('coderr_app', 'Offers')
+
+    reviews = Reviews.objects.aggregate(review_count=Count('id'), rating_sum=Sum('rating'))
+    PlatformStats.objects.update_or_create(pk=1, defaults={
+        'business_profile_count': UserProfile.objects.filter(type='business').count(),
+        'review_count': reviews['review_count'],
+        'rating_sum': reviews['rating_sum'] or 0,
+        'offer_count': Offers.objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0029_platformstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_platform_stats, migrations.RunPython.noop),
+    ]
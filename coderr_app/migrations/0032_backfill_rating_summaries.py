@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def backfill_rating_summaries(apps, schema_editor):
+    """
+    Befüllt die Bewertungsübersichten der Anbieter aus den bestehenden Bewertungen.
+    """
+    Reviews = apps.get_model('coderr_app', 'Reviews')
+    BusinessRatingSummary = apps.get_model('coderr_app', 'BusinessRatingSummary')
+
+    summaries = {}
+    rows = Reviews.objects.order_by().values('business_user', 'rating').annotate(count=Count('id'))
+    for row in rows:
+        summary = summaries.setdefault(row['business_user'], BusinessRatingSummary(business_user_id=row['business_user']))
+        summary.review_count += row['count']
+        summary.rating_sum += row['count'] * row['rating']
+        if 1 <= row['rating'] <= 5:
+            field = f"rating_{row['rating']}"
+            setattr(summary, field, getattr(summary, field) + row['count'])
+    BusinessRatingSummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0031_businessratingsummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rating_summaries, migrations.RunPython.noop),
+    ]
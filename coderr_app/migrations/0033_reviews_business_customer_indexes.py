@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-18 18:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coderr_app', '0032_backfill_rating_summaries'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['business_user', 'updated_at'], name='reviews_business_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['business_user', 'rating'], name='reviews_business_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['customer_user', 'updated_at'], name='reviews_customer_updated_idx'),
+        ),
+    ]
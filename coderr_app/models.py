@@ -1,7 +1,58 @@
+import hashlib
+import json
+import secrets
+from contextvars import ContextVar
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
 from django.db import models
+from django.db import transaction
+from django.db.models import Min, Max, Count, Sum, F, Value, Window
+from django.db.models.functions import Greatest, RowNumber, TruncDate
+from django.dispatch import Signal
+from django.utils import timezone
 from django.contrib.auth.models import User
 
-class UserProfile(models.Model):
+
+offer_aggregates_changed = Signal()
+"""
+Wird gesendet, wenn sich die gespeicherten Kennzahlen eines Angebots geändert haben.
+
+Args:
+    sender: `Offers`.
+    offer_id (int): ID des betroffenen Angebots.
+"""
+
+class LoadedValuesMixin:
+    """
+    Merkt sich die aus der Datenbank geladenen Werte der Felder in `tracked_fields`.
+
+    Dadurch können Signale nach dem Speichern erkennen, ob und wie sich ein Feld geändert
+    hat, ohne den alten Wert erneut abzufragen. Fremdschlüssel werden über ihren
+    `attname` (z. B. `business_user_id`) angegeben.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self):
+        """
+        Übernimmt die aktuellen Werte als zuletzt gespeicherten Stand.
+        """
+        self._loaded_values = {field: self.__dict__.get(field) for field in self.tracked_fields}
+
+    def get_loaded_value(self, field):
+        """
+        Gibt den zuletzt geladenen bzw. gespeicherten Wert eines Feldes zurück.
+        """
+        return getattr(self, '_loaded_values', {}).get(field)
+
+
+class UserProfile(LoadedValuesMixin, models.Model):
     """
     Erweiterung des Standard-Benutzermodells für zusätzliche Informationen über den Benutzer.
 
@@ -15,6 +66,7 @@ class UserProfile(models.Model):
         type (str): Benutzertyp, entweder 'customer', 'business' oder 'staff'.
         email (EmailField): E-Mail-Adresse des Benutzers.
         created_at (DateTimeField): Datum und Uhrzeit der Erstellung des Profils.
+        updated_at (DateTimeField): Datum und Uhrzeit der letzten Aktualisierung des Profils.
     """
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='user_profile')
     file = models.FileField(upload_to='profile_pictures/', null=True, blank=True)
@@ -30,6 +82,9 @@ class UserProfile(models.Model):
     type = models.CharField(max_length=25, choices=USER_TYPE_CHOICES)
     email = models.EmailField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    tracked_fields = ('type',)
 
     def __str__(self):
         return self.user.username
@@ -39,6 +94,38 @@ class UserProfile(models.Model):
         verbose_name_plural = 'User Profiles'
 
 
+class OffersManager(models.Manager):
+    """
+    Manager für Angebote mit Hilfsfunktionen für die gespeicherten Kennzahlen der Angebotsdetails.
+    """
+
+    def calculate_aggregates(self, offer_id):
+        """
+        Berechnet minimalen Preis sowie minimale und maximale Lieferzeit aus den Angebotsdetails.
+        """
+        return OfferDetails.objects.filter(offer_id=offer_id).aggregate(
+            min_price=Min('price'),
+            min_delivery_time=Min('delivery_time_in_days'),
+            max_delivery_time=Max('delivery_time_in_days')
+        )
+
+    def update_aggregates(self, offer_id, touch=False):
+        """
+        Schreibt die aktuellen Kennzahlen der Angebotsdetails in das Angebot zurück.
+
+        Geschrieben wird nur, wenn sich mindestens ein Wert geändert hat; in diesem Fall
+        wird `offer_aggregates_changed` gesendet. Mit `touch=True` wird `updated_at`
+        in jedem Fall aktualisiert. Gibt die berechneten Werte zurück.
+        """
+        aggregates = self.calculate_aggregates(offer_id)
+        extra = {'updated_at': timezone.now()} if touch else {}
+        if self.filter(pk=offer_id).exclude(**aggregates).update(**aggregates, **extra):
+            offer_aggregates_changed.send(sender=self.model, offer_id=offer_id)
+        elif touch:
+            self.filter(pk=offer_id).update(**extra)
+        return aggregates
+
+
 class Offers(models.Model):
     """
     Repräsentiert ein Angebot, das ein Benutzer erstellen kann.
@@ -50,6 +137,9 @@ class Offers(models.Model):
         description (TextField): Beschreibung des Angebots.
         created_at (DateTimeField): Erstellungsdatum des Angebots.
         updated_at (DateTimeField): Letzte Aktualisierung des Angebots.
+        min_price (DecimalField): Minimaler Preis aller Angebotsdetails.
+        min_delivery_time (int): Minimale Lieferzeit aller Angebotsdetails in Tagen.
+        max_delivery_time (int): Maximale Lieferzeit aller Angebotsdetails in Tagen.
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='offers')
     title = models.CharField(max_length=150)
@@ -57,9 +147,22 @@ class Offers(models.Model):
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    max_delivery_time = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+
+    objects = OffersManager()
 
     def __str__(self):
         return self.title
+
+    def update_aggregates(self):
+        """
+        Aktualisiert die gespeicherten Kennzahlen und übernimmt sie in die Instanz.
+        """
+        aggregates = Offers.objects.update_aggregates(self.pk)
+        for field, value in aggregates.items():
+            setattr(self, field, value)
     
     class Meta:
         ordering = ['title']
@@ -101,7 +204,81 @@ class OfferDetails(models.Model):
         verbose_name_plural = 'Offerdetails'
     
 
-class Orders(models.Model):
+class FeatureSnapshotManager(models.Manager):
+    """
+    Manager für inhaltsadressierte Feature-Snapshots.
+    """
+
+    @staticmethod
+    def digest(features):
+        """
+        Berechnet den SHA-256-Hash der kanonischen JSON-Darstellung einer Feature-Liste.
+        """
+        canonical = json.dumps(features, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def for_features(self, features):
+        """
+        Gibt den Snapshot für die Feature-Liste zurück und legt ihn bei Bedarf an.
+        """
+        snapshot, _ = self.get_or_create(digest=self.digest(features), defaults={'features': features})
+        return snapshot
+
+
+class FeatureSnapshot(models.Model):
+    """
+    Einmalig gespeicherte Feature-Liste, auf die Bestellungen verweisen.
+
+    Bestellungen desselben Angebotsdetails teilen sich so eine Zeile, statt die Liste
+    jeweils zu kopieren.
+
+    Attributes:
+        digest (str): SHA-256-Hash der kanonischen JSON-Darstellung.
+        features (JSONField): Die Feature-Liste.
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    features = models.JSONField()
+
+    objects = FeatureSnapshotManager()
+
+    def __str__(self):
+        return self.digest
+
+    class Meta:
+        verbose_name_plural = 'Feature Snapshots'
+
+
+class FeatureSnapshotMixin:
+    """
+    Stellt `features` einer Bestellung als Eigenschaft über `features_snapshot` bereit.
+
+    Zugewiesene Listen werden beim Speichern dem passenden `FeatureSnapshot` zugeordnet,
+    sodass `Orders.objects.create(features=[...])` weiterhin funktioniert. Beim Auflisten
+    sollte `features_snapshot` per `select_related` geladen werden.
+    """
+
+    @property
+    def features(self):
+        pending = getattr(self, '_pending_features', None)
+        if pending is not None:
+            return pending
+        if self.features_snapshot_id is None:
+            return None
+        return self.features_snapshot.features
+
+    @features.setter
+    def features(self, value):
+        self._pending_features = value
+
+    def save(self, *args, **kwargs):
+        pending = getattr(self, '_pending_features', None)
+        if pending is not None:
+            self.features_snapshot = FeatureSnapshot.objects.for_features(pending)
+            self._pending_features = None
+        super().save(*args, **kwargs)
+
+
+class Orders(FeatureSnapshotMixin, LoadedValuesMixin, models.Model):
     """
     Repräsentiert eine Bestellung, die ein Kunde bei einem Anbieter tätigt.
 
@@ -114,7 +291,7 @@ class Orders(models.Model):
         revisions (int): Anzahl der Überarbeitungen in der Bestellung.
         delivery_time_in_days (int): Lieferzeit in Tagen.
         price (DecimalField): Preis für die Bestellung.
-        features (JSONField): Merkmale der Bestellung im JSON-Format.
+        features_snapshot (FeatureSnapshot): Merkmale der Bestellung, verfügbar über `features`.
         offer_type (str): Typ des bestellten Angebots.
         created_at (DateTimeField): Erstellungsdatum der Bestellung.
         updated_at (DateTimeField): Datum der letzten Aktualisierung.
@@ -128,21 +305,322 @@ class Orders(models.Model):
     revisions = models.IntegerField()
     delivery_time_in_days = models.PositiveIntegerField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
-    features = models.JSONField()
+    features_snapshot = models.ForeignKey(FeatureSnapshot, on_delete=models.PROTECT, related_name='orders')
     offer_type = models.CharField(max_length=50)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=25)
 
+    tracked_fields = ('business_user_id', 'status', 'price')
+
     def __str__(self):
         return f'Order by {self.customer_user.username} for {self.title}'
     
     class Meta:
         ordering = ['title']
         verbose_name_plural = 'Orders'
+        indexes = [
+            models.Index(fields=['customer_user', 'created_at'], name='orders_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at'], name='orders_business_created_idx'),
+        ]
     
 
-class Reviews(models.Model):
+# IDs der Bestellungen, die `OrdersArchiveManager.archive_batch` im aktuellen Kontext löscht.
+_archiving_order_ids = ContextVar('archiving_order_ids', default=frozenset())
+
+
+class OrdersArchiveManager(models.Manager):
+    """
+    Manager für archivierte Bestellungen mit der Verschiebe-Logik aus `Orders`.
+    """
+    ARCHIVABLE_STATUSES = ('completed', 'cancelled')
+
+    def archive_batch(self, before, batch_size=500):
+        """
+        Verschiebt bis zu `batch_size` abgeschlossene oder stornierte Bestellungen, die seit
+        `before` nicht mehr geändert wurden, in einer Transaktion ins Archiv.
+
+        Die Originalzeilen werden regulär gelöscht; solange `is_archiving` für sie gilt,
+        überspringen die Empfänger von `post_delete` die Anpassung von Bestellzählern und
+        Umsatz-Rollups, die archivierte Bestellungen weiterhin enthalten. Gibt die Anzahl
+        der archivierten Bestellungen zurück.
+        """
+        with transaction.atomic():
+            orders = list(
+                Orders.objects.filter(status__in=self.ARCHIVABLE_STATUSES, updated_at__lt=before)
+                .order_by('id').values(*OrdersArchive.ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not orders:
+                return 0
+            order_ids = frozenset(order['id'] for order in orders)
+            self.bulk_create([OrdersArchive(**order) for order in orders])
+            token = _archiving_order_ids.set(order_ids)
+            try:
+                Orders.objects.filter(id__in=order_ids).delete()
+            finally:
+                _archiving_order_ids.reset(token)
+        return len(orders)
+
+    def is_archiving(self, order_id):
+        """
+        Gibt an, ob die Bestellung gerade von `archive_batch` ins Archiv verschoben wird.
+        """
+        return order_id in _archiving_order_ids.get()
+
+
+class OrdersArchive(FeatureSnapshotMixin, models.Model):
+    """
+    Archivierte, abgeschlossene oder stornierte Bestellungen.
+
+    Die Zeilen werden von `archive_orders` aus `Orders` verschoben und behalten ihre
+    ursprüngliche ID, sodass Links auf Bestellungen gültig bleiben. Die Snapshot-Spalten
+    machen das Archiv unabhängig von später geänderten oder gelöschten Angeboten.
+
+    Attributes:
+        id (int): Ursprüngliche ID der Bestellung.
+        customer_user (User): Der Kunde der Bestellung.
+        business_user (User): Der Anbieter der Bestellung.
+        offer (Offers): Das bestellte Angebot, falls es noch existiert.
+        offer_details (OfferDetails): Das bestellte Angebotsdetail, falls es noch existiert.
+        title, revisions, delivery_time_in_days, price, features_snapshot, offer_type, status:
+            Werte der Bestellung zum Zeitpunkt der Archivierung.
+        created_at (DateTimeField): Erstellungsdatum der Bestellung.
+        updated_at (DateTimeField): Datum der letzten Aktualisierung vor der Archivierung.
+        archived_at (DateTimeField): Zeitpunkt der Archivierung.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(User, related_name='archived_customer_orders', on_delete=models.CASCADE)
+    business_user = models.ForeignKey(User, related_name='archived_business_orders', on_delete=models.CASCADE)
+    offer = models.ForeignKey('Offers', on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_orders')
+    offer_details = models.ForeignKey('OfferDetails', on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_orders')
+    title = models.CharField(max_length=150)
+    revisions = models.IntegerField()
+    delivery_time_in_days = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features_snapshot = models.ForeignKey(FeatureSnapshot, on_delete=models.PROTECT, related_name='archived_orders')
+    offer_type = models.CharField(max_length=50)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    status = models.CharField(max_length=25)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OrdersArchiveManager()
+
+    ARCHIVED_FIELDS = (
+        'id', 'customer_user_id', 'business_user_id', 'offer_id', 'offer_details_id', 'title', 'revisions',
+        'delivery_time_in_days', 'price', 'features_snapshot_id', 'offer_type', 'created_at', 'updated_at', 'status'
+    )
+
+    def __str__(self):
+        return f'Archived order {self.id} for {self.title}'
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Orders Archive'
+
+
+class OrderStatusCounterManager(models.Manager):
+    """
+    Manager für die Bestellzähler mit Hilfsfunktionen zum Anpassen und Neuaufbauen.
+    """
+
+    def adjust(self, business_user_id, status, delta):
+        """
+        Verändert den Zähler eines Status um `delta`.
+
+        Unbekannte Status werden ignoriert. Im Normalfall genügt ein einzelnes `UPDATE`; beim
+        Erhöhen wird eine fehlende Zeile angelegt, beim Verringern wird sie nicht neu erzeugt
+        und der Wert fällt nie unter 0.
+        """
+        if business_user_id is None or status not in OrderStatusCounter.STATUSES:
+            return
+        counters = self.filter(business_user_id=business_user_id)
+        if counters.update(**{status: Greatest(F(status) + delta, Value(0))}) or delta < 0:
+            return
+        counter, created = self.get_or_create(business_user_id=business_user_id, defaults={status: delta})
+        if not created:
+            counters.update(**{status: F(status) + delta})
+
+    @transaction.atomic
+    def rebuild_for(self, business_user_id):
+        """
+        Legt die fehlenden Zähler eines einzelnen Anbieters aus `Orders` und `OrdersArchive` an und gibt sie zurück.
+
+        Zählen und Schreiben laufen in einer Transaktion, die unter `transaction_mode`
+        `IMMEDIATE` sofort die Schreibsperre hält. Eine bereits vorhandene Zeile wird nie
+        überschrieben, damit per Signal angepasste Zähler nicht verloren gehen.
+        """
+        counts = dict.fromkeys(OrderStatusCounter.STATUSES, 0)
+        for model in (Orders, OrdersArchive):
+            rows = model.objects.filter(business_user_id=business_user_id, status__in=OrderStatusCounter.STATUSES).order_by().values('status').annotate(count=Count('id'))
+            for row in rows:
+                counts[row['status']] += row['count']
+        counter, _ = self.get_or_create(business_user_id=business_user_id, defaults=counts)
+        return counter
+
+    @transaction.atomic
+    def rebuild(self):
+        """
+        Baut alle Zähler aus `Orders` und `OrdersArchive` neu auf und gibt die Anzahl der Zeilen zurück.
+        """
+        counters = {}
+        for model in (Orders, OrdersArchive):
+            rows = model.objects.filter(status__in=OrderStatusCounter.STATUSES).order_by().values('business_user', 'status').annotate(count=Count('id'))
+            for row in rows:
+                counter = counters.setdefault(row['business_user'], OrderStatusCounter(business_user_id=row['business_user']))
+                setattr(counter, row['status'], getattr(counter, row['status']) + row['count'])
+
+        self.all().delete()
+        self.bulk_create(counters.values())
+        return len(counters)
+
+
+class OrderStatusCounter(models.Model):
+    """
+    Vorberechnete Anzahl der Bestellungen eines Anbieters je Status.
+
+    Die Zähler werden per Signal in derselben Transaktion wie das Anlegen, Ändern oder
+    Löschen einer Bestellung angepasst und können mit `rebuild_order_status_counters`
+    neu aufgebaut werden. Archivierte Bestellungen (`OrdersArchive`) bleiben mitgezählt.
+
+    Attributes:
+        business_user (User): Der Anbieter, zu dem die Zähler gehören.
+        in_progress (int): Anzahl der laufenden Bestellungen.
+        completed (int): Anzahl der abgeschlossenen Bestellungen.
+        cancelled (int): Anzahl der stornierten Bestellungen.
+    """
+    STATUSES = ('in_progress', 'completed', 'cancelled')
+
+    business_user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='order_status_counter')
+    in_progress = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+
+    objects = OrderStatusCounterManager()
+
+    def __str__(self):
+        return f'Order counts for {self.business_user_id}'
+
+    class Meta:
+        verbose_name_plural = 'Order Status Counters'
+
+
+class RevenueRollupManager(models.Manager):
+    """
+    Manager für die Umsatz-Rollups mit Hilfsfunktionen zum Anpassen und Neuaufbauen.
+    """
+
+    def adjust(self, business_user_id, day, status, count, amount):
+        """
+        Verändert Anzahl und Umsatzsumme eines Rollups um `count` bzw. `amount`.
+
+        Im Normalfall genügt ein einzelnes `UPDATE`; eine fehlende Zeile wird nur beim
+        Hinzufügen angelegt. Wie bei den Bestellzählern fällt die Anzahl nie unter 0, damit
+        eine Abweichung (z. B. nach `QuerySet.update`) das Speichern der Bestellung nicht
+        scheitern lässt.
+        """
+        if business_user_id is None or status is None:
+            return
+        amount = Decimal(str(amount))
+        rollups = self.filter(business_user_id=business_user_id, day=day, status=status)
+        changes = {'order_count': Greatest(F('order_count') + count, Value(0)), 'price_sum': F('price_sum') + amount}
+        if rollups.update(**changes) or count < 0:
+            return
+        rollup, created = self.get_or_create(
+            business_user_id=business_user_id, day=day, status=status,
+            defaults={'order_count': count, 'price_sum': amount}
+        )
+        if not created:
+            rollups.update(**changes)
+
+    @transaction.atomic
+    def rebuild(self, chunk_size=5000):
+        """
+        Baut alle Rollups aus `Orders` und `OrdersArchive` neu auf und gibt die Anzahl der Zeilen zurück.
+
+        Die Historie wird in ID-Blöcken von `chunk_size` Bestellungen gruppiert summiert.
+        Lesen und Ersetzen laufen in einer Transaktion; da SQLite mit `transaction_mode`
+        `IMMEDIATE` die Schreibsperre sofort nimmt, kann währenddessen keine Bestellung
+        angelegt oder geändert werden, die beim Ersetzen verloren ginge.
+        """
+        rollups = {}
+        for model in (Orders, OrdersArchive):
+            last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+            for start in range(0, last_id + 1, chunk_size):
+                rows = model.objects.filter(id__gte=start, id__lt=start + chunk_size).order_by().values(
+                    'business_user', 'status', day=TruncDate('created_at')
+                ).annotate(order_count=Count('id'), price_sum=Sum('price'))
+                for row in rows:
+                    key = (row['business_user'], row['day'], row['status'])
+                    rollup = rollups.setdefault(key, RevenueRollup(business_user_id=key[0], day=key[1], status=key[2]))
+                    rollup.order_count += row['order_count']
+                    rollup.price_sum += row['price_sum']
+
+        self.all().delete()
+        self.bulk_create(rollups.values(), batch_size=500)
+        return len(rollups)
+
+
+class RevenueRollup(models.Model):
+    """
+    Anzahl und Umsatzsumme der Bestellungen eines Anbieters je Tag und Status.
+
+    Der Tag ist das Erstellungsdatum der Bestellung. Die Rollups werden per Signal in
+    derselben Transaktion wie das Anlegen, Ändern oder Löschen einer Bestellung angepasst
+    und können mit `rebuild_revenue_rollups` neu aufgebaut werden. Archivierte Bestellungen
+    bleiben enthalten.
+
+    Attributes:
+        business_user (User): Der Anbieter, zu dem das Rollup gehört.
+        day (DateField): Erstellungstag der Bestellungen.
+        status (str): Status der Bestellungen.
+        order_count (int): Anzahl der Bestellungen.
+        price_sum (DecimalField): Summe der bezahlten Preise.
+    """
+    business_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='revenue_rollups')
+    day = models.DateField()
+    status = models.CharField(max_length=25)
+    order_count = models.PositiveIntegerField(default=0)
+    price_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = RevenueRollupManager()
+
+    def __str__(self):
+        return f'Revenue of {self.business_user_id} on {self.day} ({self.status})'
+
+    class Meta:
+        ordering = ['day']
+        verbose_name_plural = 'Revenue Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['business_user', 'day', 'status'], name='unique_revenue_rollup'),
+        ]
+
+
+class ReviewsManager(models.Manager):
+    """
+    Manager für Bewertungen mit einer Abfrage der besten bzw. neuesten Bewertungen je Anbieter.
+    """
+    TOP_ORDERINGS = ('-updated_at', 'updated_at', '-rating', 'rating')
+
+    def top_per_business(self, business_user_ids, limit, ordering='-updated_at'):
+        """
+        Gibt je Anbieter die ersten `limit` Bewertungen in der Sortierung `ordering` zurück.
+
+        Die Nummerierung erfolgt mit `ROW_NUMBER() OVER (PARTITION BY business_user_id ...)`
+        und `id` als Tie-Breaker, sodass alle Anbieter mit einer einzigen Abfrage geladen werden.
+        Das Ergebnis ist nach Anbieter und Rang sortiert.
+        """
+        field = ordering.lstrip('-')
+        if ordering.startswith('-'):
+            window_ordering = [F(field).desc(), F('id').desc()]
+        else:
+            window_ordering = [F(field).asc(), F('id').asc()]
+        return self.filter(business_user_id__in=business_user_ids).annotate(
+            rank=Window(RowNumber(), partition_by=F('business_user_id'), order_by=window_ordering)
+        ).filter(rank__lte=limit).order_by('business_user_id', 'rank')
+
+
+class Reviews(LoadedValuesMixin, models.Model):
     """
     Repräsentiert eine Bewertung, die ein Kunde für ein Angebot hinterlässt.
 
@@ -161,9 +639,261 @@ class Reviews(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReviewsManager()
+
+    tracked_fields = ('business_user_id', 'rating')
+
     def __str__(self):
         return f'Review for {self.business_user} by {self.customer_user}'
     
     class Meta:
         ordering = ['rating']
-        verbose_name_plural = 'Reviews'
\ No newline at end of file
+        verbose_name_plural = 'Reviews'
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at'], name='reviews_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating'], name='reviews_business_rating_idx'),
+            models.Index(fields=['customer_user', 'updated_at'], name='reviews_customer_updated_idx'),
+        ]
+
+
+class BusinessRatingSummaryManager(models.Manager):
+    """
+    Manager für die Bewertungsübersichten der Anbieter mit Hilfsfunktionen zum Anpassen und Neuaufbauen.
+    """
+
+    def adjust(self, business_user_id, rating, delta):
+        """
+        Zählt eine Bewertung mit `rating` Sternen `delta`-mal hinzu (oder entfernt sie bei negativem `delta`).
+
+        Wie bei den Bestellzählern genügt im Normalfall ein einzelnes `UPDATE`; beim Erhöhen
+        wird eine fehlende Zeile angelegt, beim Verringern nicht. Sterne außerhalb von 1–5
+        fließen in Anzahl und Summe, aber nicht in das Histogramm ein.
+        """
+        if business_user_id is None or rating is None:
+            return
+        changes = {
+            'review_count': Greatest(F('review_count') + delta, Value(0)),
+            'rating_sum': F('rating_sum') + delta * rating,
+        }
+        histogram_field = BusinessRatingSummary.histogram_field(rating)
+        if histogram_field:
+            changes[histogram_field] = Greatest(F(histogram_field) + delta, Value(0))
+        summaries = self.filter(business_user_id=business_user_id)
+        if summaries.update(**changes) or delta < 0:
+            return
+        self.get_or_create(business_user_id=business_user_id)
+        summaries.update(**changes)
+
+    @transaction.atomic
+    def rebuild(self):
+        """
+        Baut alle Bewertungsübersichten aus `Reviews` neu auf und gibt die Anzahl der Zeilen zurück.
+        """
+        summaries = {}
+        rows = Reviews.objects.order_by().values('business_user', 'rating').annotate(count=Count('id'))
+        for row in rows:
+            summary = summaries.setdefault(row['business_user'], BusinessRatingSummary(business_user_id=row['business_user']))
+            summary.review_count += row['count']
+            summary.rating_sum += row['count'] * row['rating']
+            histogram_field = BusinessRatingSummary.histogram_field(row['rating'])
+            if histogram_field:
+                setattr(summary, histogram_field, getattr(summary, histogram_field) + row['count'])
+
+        self.all().delete()
+        self.bulk_create(summaries.values())
+        return len(summaries)
+
+
+class BusinessRatingSummary(models.Model):
+    """
+    Vorberechnete Bewertungsübersicht eines Anbieters: Anzahl, Durchschnitt und Sterne-Histogramm.
+
+    Die Werte werden per Signal in derselben Transaktion wie das Anlegen, Ändern oder
+    Löschen einer Bewertung angepasst und können mit `rebuild_rating_summaries` neu
+    aufgebaut werden.
+
+    Attributes:
+        business_user (User): Der Anbieter, zu dem die Übersicht gehört.
+        review_count (int): Anzahl der Bewertungen.
+        rating_sum (int): Summe aller Sterne für den Durchschnitt.
+        rating_1 … rating_5 (int): Anzahl der Bewertungen mit 1 bis 5 Sternen.
+    """
+    STARS = range(1, 6)
+
+    business_user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='rating_summary')
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    objects = BusinessRatingSummaryManager()
+
+    @staticmethod
+    def histogram_field(rating):
+        """
+        Gibt das Histogrammfeld für `rating` Sterne zurück, `None` außerhalb von 1–5.
+        """
+        return f'rating_{rating}' if rating in BusinessRatingSummary.STARS else None
+
+    @property
+    def average_rating(self):
+        """
+        Durchschnittliche Bewertung auf eine Nachkommastelle, 0 ohne Bewertungen.
+        """
+        if self.review_count <= 0:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        """
+        Anzahl der Bewertungen je Sternezahl als Dictionary `{'1': …, '5': …}`.
+        """
+        return {str(stars): getattr(self, f'rating_{stars}') for stars in self.STARS}
+
+    def __str__(self):
+        return f'Rating summary for {self.business_user_id}'
+
+    class Meta:
+        verbose_name_plural = 'Business Rating Summaries'
+
+
+class PlatformStatsManager(models.Manager):
+    """
+    Manager für die Plattformstatistik mit Hilfsfunktionen zum Lesen, Anpassen und Neuaufbauen.
+    """
+    STATS_ID = 1
+
+    def adjust(self, **deltas):
+        """
+        Verändert die angegebenen Zähler um die jeweiligen Werte mit einem einzelnen `UPDATE`.
+
+        Fehlt die Zeile, wird sie aus dem aktuellen Datenbestand neu berechnet.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        if not self.filter(pk=self.STATS_ID).update(**{field: F(field) + delta for field, delta in deltas.items()}):
+            self.rebuild()
+
+    def get_current(self):
+        """
+        Liest die Statistikzeile, `None`, wenn sie fehlt.
+        """
+        return self.filter(pk=self.STATS_ID).first()
+
+    def get_stats(self):
+        """
+        Liest die Statistikzeile und baut sie bei Bedarf auf.
+        """
+        return self.get_current() or self.rebuild()
+
+    def rebuild(self):
+        """
+        Berechnet alle Werte mit je einer Aggregat-Abfrage neu und speichert sie.
+        """
+        reviews = Reviews.objects.aggregate(review_count=Count('id'), rating_sum=Sum('rating'))
+        stats, _ = self.update_or_create(pk=self.STATS_ID, defaults={
+            'business_profile_count': UserProfile.objects.filter(type='business').count(),
+            'review_count': reviews['review_count'],
+            'rating_sum': reviews['rating_sum'] or 0,
+            'offer_count': Offers.objects.count(),
+        })
+        return stats
+
+
+class PlatformStats(models.Model):
+    """
+    Einzelne Zeile mit den Kennzahlen für `/base-info/`.
+
+    Die Werte werden per Signal beim Anlegen, Ändern und Löschen von Benutzerprofilen,
+    Bewertungen und Angeboten angepasst und können mit `rebuild_platform_stats` neu
+    berechnet werden.
+
+    Attributes:
+        business_profile_count (int): Anzahl der Geschäftsprofile.
+        review_count (int): Anzahl der Bewertungen.
+        rating_sum (int): Summe aller Bewertungen für den Durchschnitt.
+        offer_count (int): Anzahl der Angebote.
+    """
+    business_profile_count = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+
+    objects = PlatformStatsManager()
+
+    @property
+    def average_rating(self):
+        """
+        Durchschnittliche Bewertung auf eine Nachkommastelle, 0 ohne Bewertungen.
+        """
+        if self.review_count <= 0:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    def __str__(self):
+        return 'Platform stats'
+
+    class Meta:
+        verbose_name_plural = 'Platform Stats'
+
+
+class OrderEventTicketManager(models.Manager):
+    """
+    Manager für kurzlebige Tickets zum Öffnen des Ereignis-Streams `/order-events/`.
+    """
+
+    def issue(self, user):
+        """
+        Stellt ein neues Ticket für `user` aus, das `ORDER_EVENTS_TICKET_TTL` Sekunden gültig ist.
+
+        Abgelaufene Tickets werden dabei entfernt.
+        """
+        now = timezone.now()
+        self.filter(expires_at__lte=now).delete()
+        return self.create(
+            key=secrets.token_urlsafe(32),
+            user=user,
+            expires_at=now + timedelta(seconds=settings.ORDER_EVENTS_TICKET_TTL),
+        )
+
+    def redeem(self, key):
+        """
+        Löst ein gültiges Ticket genau einmal ein und gibt den Benutzer samt Profil zurück.
+
+        Gibt `None` zurück, wenn das Ticket unbekannt, abgelaufen oder bereits eingelöst ist.
+        """
+        ticket = self.select_related('user__user_profile').filter(key=key, expires_at__gt=timezone.now()).first()
+        if ticket is None or not self.filter(pk=ticket.pk).delete()[0]:
+            return None
+        return ticket.user
+
+
+class OrderEventTicket(models.Model):
+    """
+    Einmal verwendbares, kurzlebiges Ticket für den Ereignis-Stream.
+
+    `EventSource` kann keine Header setzen; statt des dauerhaften API-Tokens steht daher
+    dieses Ticket im Query-String (`?ticket=`), sodass in Zugriffsprotokollen, Proxys und
+    dem Browserverlauf nur ein bereits verbrauchter bzw. abgelaufener Wert landet.
+
+    Attributes:
+        key (str): Zufälliger Ticketwert.
+        user (User): Benutzer, für den das Ticket ausgestellt wurde.
+        expires_at (datetime): Ablaufzeitpunkt.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='order_event_tickets')
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = OrderEventTicketManager()
+
+    def __str__(self):
+        return f'Order event ticket for {self.user_id}'
+
+    class Meta:
+        verbose_name_plural = 'Order Event Tickets'
@@ -1,7 +1,9 @@
 from django.db import transaction
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import UserProfile
+from django.utils import timezone
+from .models import UserProfile, Offers, OrdersArchive, OrderStatusCounter, RevenueRollup, PlatformStats, BusinessRatingSummary
+from .api import cache as offers_cache
 
 @transaction.atomic
 def create_guest_accounts(sender, **kwargs):
@@ -63,3 +65,244 @@ def create_guest_accounts(sender, **kwargs):
         )
         UserProfile.objects.create(user=business, email=business.email, type='business', tel='49123456789', working_hours='9-17', description='Test Business User Developer', location='Testlocation')
         print(f'Business Guestuser created: {business}')
+
+
+def update_offer_aggregates(sender, instance, **kwargs):
+    """
+    Aktualisiert die gespeicherten Kennzahlen eines Angebots, sobald eines seiner
+    Angebotsdetails gespeichert oder gelöscht wird.
+
+    Die Funktion ist mit `post_save` und `post_delete` von `OfferDetails` verbunden und
+    läuft damit in derselben Transaktion wie die auslösende Änderung. `updated_at` des
+    Angebots wird ebenfalls aktualisiert, damit bedingte GET-Anfragen die Änderung erkennen.
+
+    Args:
+        sender: Das Modell, das das Signal auslöst (`OfferDetails`).
+        instance: Das gespeicherte bzw. gelöschte Angebotsdetail.
+        **kwargs: Zusätzliche Schlüsselwortargumente des Signals.
+    """
+    Offers.objects.update_aggregates(instance.offer_id, touch=True)
+
+
+def invalidate_offer_cache_on_save(sender, instance, created, **kwargs):
+    """
+    Invalidiert den Angebotscache nach dem Speichern eines Angebots.
+
+    Neue Angebote verändern alle Listen, bearbeitete Angebote nur die Einträge, die das
+    Angebot enthalten, sowie Suchlisten (Titel und Beschreibung können sich geändert haben).
+    Die Invalidierung erfolgt erst nach dem Commit der Transaktion.
+    """
+    if created:
+        transaction.on_commit(offers_cache.invalidate_catalog)
+    else:
+        transaction.on_commit(lambda: offers_cache.invalidate_offers([instance.pk]))
+        transaction.on_commit(offers_cache.invalidate_search)
+
+
+def invalidate_offer_cache_on_delete(sender, instance, **kwargs):
+    """
+    Invalidiert alle Angebotslisten und das gelöschte Angebot nach dem Commit.
+    """
+    offer_id = instance.pk
+    transaction.on_commit(lambda: offers_cache.invalidate_offers([offer_id]))
+    transaction.on_commit(offers_cache.invalidate_catalog)
+
+
+def invalidate_offer_detail_cache(sender, instance, **kwargs):
+    """
+    Invalidiert die gecachten Antworten, die das Angebot des geänderten Angebotsdetails enthalten.
+    """
+    offer_id = instance.offer_id
+    transaction.on_commit(lambda: offers_cache.invalidate_offers([offer_id]))
+
+
+def invalidate_catalog_on_aggregates_changed(sender, offer_id, **kwargs):
+    """
+    Invalidiert alle Angebotslisten und das Angebot selbst, wenn sich Preis oder Lieferzeiten
+    geändert haben, da diese Filter und Sortierung der Listen beeinflussen.
+    """
+    transaction.on_commit(lambda: offers_cache.invalidate_offers([offer_id]))
+    transaction.on_commit(offers_cache.invalidate_catalog)
+
+
+def invalidate_user_offers_cache(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Invalidiert die gecachten Angebote eines Benutzers, wenn sich dessen Name geändert haben kann.
+
+    Speichervorgänge, die nur andere Felder betreffen (z. B. `last_login`), werden ignoriert.
+    """
+    if created:
+        return
+    if update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields):
+        return
+    offer_ids = list(Offers.objects.filter(user=instance).values_list('pk', flat=True))
+    if offer_ids:
+        transaction.on_commit(lambda: offers_cache.invalidate_offers(offer_ids))
+
+
+def touch_user_related_objects(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Aktualisiert `updated_at` von Profil und Angeboten eines Benutzers, wenn sich dessen
+    Name geändert haben kann, da beide den Namen in ihrer Antwort enthalten.
+    """
+    if created:
+        return
+    if update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields):
+        return
+    now = timezone.now()
+    UserProfile.objects.filter(user=instance).update(updated_at=now)
+    Offers.objects.filter(user=instance).update(updated_at=now)
+
+
+def update_order_status_counters(sender, instance, created, raw=False, **kwargs):
+    """
+    Passt die Bestellzähler des Anbieters an, wenn eine Bestellung angelegt wurde oder
+    sich ihr Status bzw. Anbieter geändert hat.
+
+    Der vorherige Stand stammt aus den beim Laden gemerkten Werten (`LoadedValuesMixin`),
+    sodass keine zusätzliche Abfrage nötig ist. Die Anpassung läuft in derselben
+    Transaktion wie das Speichern der Bestellung.
+    """
+    if raw:
+        return
+    previous = (None, None) if created else (instance.get_loaded_value('business_user_id'), instance.get_loaded_value('status'))
+    current = (instance.business_user_id, instance.status)
+    if previous != current:
+        OrderStatusCounter.objects.adjust(*previous, -1)
+        OrderStatusCounter.objects.adjust(*current, 1)
+
+
+def update_revenue_rollups(sender, instance, created, raw=False, **kwargs):
+    """
+    Passt die Umsatz-Rollups an, wenn eine Bestellung angelegt wurde oder sich Status,
+    Anbieter oder Preis geändert haben.
+
+    Wie bei den Bestellzählern stammt der vorherige Stand aus den beim Laden gemerkten Werten.
+    """
+    if raw:
+        return
+    day = timezone.localdate(instance.created_at)
+    current = (instance.business_user_id, instance.status, instance.price)
+    if created:
+        RevenueRollup.objects.adjust(instance.business_user_id, day, instance.status, 1, instance.price)
+        return
+    previous = tuple(instance.get_loaded_value(field) for field in ('business_user_id', 'status', 'price'))
+    if previous != current:
+        RevenueRollup.objects.adjust(previous[0], day, previous[1], -1, -(previous[2] or 0))
+        RevenueRollup.objects.adjust(instance.business_user_id, day, instance.status, 1, instance.price)
+
+
+def remember_loaded_values(sender, instance, raw=False, **kwargs):
+    """
+    Übernimmt die gespeicherten Werte als neuen Ausgangsstand (`LoadedValuesMixin`).
+
+    Wird jeweils als letzter `post_save`-Empfänger verbunden, nachdem alle abgeleiteten
+    Werte (Bestellzähler, Umsatz-Rollups, Statistiken) angepasst wurden.
+    """
+    instance.remember_loaded_values()
+
+
+def decrement_order_status_counters(sender, instance, **kwargs):
+    """
+    Verringert den Bestellzähler des Anbieters, wenn eine Bestellung gelöscht wird.
+
+    Maßgeblich ist der zuletzt gespeicherte Stand der Bestellung. Archivierte Bestellungen
+    bleiben mitgezählt.
+    """
+    if OrdersArchive.objects.is_archiving(instance.pk):
+        return
+    OrderStatusCounter.objects.adjust(instance.get_loaded_value('business_user_id'), instance.get_loaded_value('status'), -1)
+
+
+def decrement_revenue_rollups(sender, instance, **kwargs):
+    """
+    Entfernt eine gelöschte Bestellung aus den Umsatz-Rollups.
+
+    Archivierte Bestellungen bleiben enthalten.
+    """
+    if OrdersArchive.objects.is_archiving(instance.pk):
+        return
+    RevenueRollup.objects.adjust(
+        instance.get_loaded_value('business_user_id'), timezone.localdate(instance.created_at),
+        instance.get_loaded_value('status'), -1, -(instance.get_loaded_value('price') or 0)
+    )
+
+
+def update_platform_stats_on_profile_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Passt die Anzahl der Geschäftsprofile an, wenn ein Profil angelegt wird oder seinen Typ wechselt.
+    """
+    if raw:
+        return
+    was_business = not created and instance.get_loaded_value('type') == 'business'
+    is_business = instance.type == 'business'
+    if was_business != is_business:
+        PlatformStats.objects.adjust(business_profile_count=1 if is_business else -1)
+
+
+def update_platform_stats_on_profile_delete(sender, instance, **kwargs):
+    """
+    Verringert die Anzahl der Geschäftsprofile, wenn ein Geschäftsprofil gelöscht wird.
+    """
+    if instance.get_loaded_value('type') == 'business':
+        PlatformStats.objects.adjust(business_profile_count=-1)
+
+
+def update_platform_stats_on_review_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Passt Anzahl und Summe der Bewertungen an, wenn eine Bewertung angelegt oder geändert wird.
+    """
+    if raw:
+        return
+    if created:
+        PlatformStats.objects.adjust(review_count=1, rating_sum=instance.rating)
+        return
+    previous_rating = instance.get_loaded_value('rating')
+    if previous_rating is not None:
+        PlatformStats.objects.adjust(rating_sum=instance.rating - previous_rating)
+
+
+def update_platform_stats_on_review_delete(sender, instance, **kwargs):
+    """
+    Entfernt eine gelöschte Bewertung aus Anzahl und Summe der Bewertungen.
+    """
+    PlatformStats.objects.adjust(review_count=-1, rating_sum=-(instance.get_loaded_value('rating') or 0))
+
+
+def update_platform_stats_on_offer_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Erhöht die Anzahl der Angebote, wenn ein Angebot angelegt wird.
+    """
+    if created and not raw:
+        PlatformStats.objects.adjust(offer_count=1)
+
+
+def update_platform_stats_on_offer_delete(sender, instance, **kwargs):
+    """
+    Verringert die Anzahl der Angebote, wenn ein Angebot gelöscht wird.
+    """
+    PlatformStats.objects.adjust(offer_count=-1)
+
+
+def update_rating_summary_on_review_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Passt die Bewertungsübersicht des Anbieters an, wenn eine Bewertung angelegt wurde oder
+    sich Sterne bzw. Anbieter geändert haben.
+
+    Der vorherige Stand stammt aus den beim Laden gemerkten Werten (`LoadedValuesMixin`);
+    die Anpassung läuft in derselben Transaktion wie das Speichern der Bewertung.
+    """
+    if raw:
+        return
+    previous = (None, None) if created else (instance.get_loaded_value('business_user_id'), instance.get_loaded_value('rating'))
+    current = (instance.business_user_id, instance.rating)
+    if previous != current:
+        BusinessRatingSummary.objects.adjust(*previous, -1)
+        BusinessRatingSummary.objects.adjust(*current, 1)
+
+
+def update_rating_summary_on_review_delete(sender, instance, **kwargs):
+    """
+    Entfernt eine gelöschte Bewertung aus der Bewertungsübersicht des Anbieters.
+    """
+    BusinessRatingSummary.objects.adjust(instance.get_loaded_value('business_user_id'), instance.get_loaded_value('rating'), -1)
@@ -2,7 +2,7 @@ from rest_framework.test import APITestCase, APIClient
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework import status
-from coderr_app.models import UserProfile, Offers, OfferDetails, Orders
+from coderr_app.models import UserProfile, Offers, OfferDetails, Orders, Reviews, PlatformStats
 from rest_framework.authtoken.models import Token
 
 
@@ -123,4 +123,70 @@ class BaseInfoTests(APITestCase):
         
         self.client.credentials()
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+    def test_get_base_info_values(self):
+        Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=4, description='Gut')
+        Reviews.objects.create(business_user=self.business, customer_user=self.admin, rating=5, description='Sehr gut')
+        url = reverse('base-info')
+
+        response = self.client.get(url)
+        self.assertEqual(response.data, {
+            'business_profile_count': 1,
+            'review_count': 2,
+            'offer_count': 1,
+            'average_rating': 4.5
+        })
+
+
+    def test_get_base_info_is_single_query(self):
+        url = reverse('base-info')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+    def test_base_info_follows_review_changes(self):
+        review = Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=2, description='Okay')
+        review = Reviews.objects.get(pk=review.pk)
+        review.rating = 5
+        review.save()
+        self.assertEqual(PlatformStats.objects.get_stats().average_rating, 5)
+
+        review.delete()
+        stats = PlatformStats.objects.get_stats()
+        self.assertEqual((stats.review_count, stats.rating_sum, stats.average_rating), (0, 0, 0))
+
+
+    def test_base_info_follows_profile_and_offer_changes(self):
+        self.user_profile_customer.type = 'business'
+        self.user_profile_customer.save()
+        self.assertEqual(PlatformStats.objects.get_stats().business_profile_count, 2)
+
+        self.user_profile.delete()
+        self.offer.delete()
+        stats = PlatformStats.objects.get_stats()
+        self.assertEqual((stats.business_profile_count, stats.offer_count), (1, 0))
+
+
+    def test_rebuild_matches_incremental_stats(self):
+        Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=3, description='Mittel')
+        incremental = PlatformStats.objects.get_stats()
+
+        rebuilt = PlatformStats.objects.rebuild()
+        self.assertEqual(
+            (incremental.business_profile_count, incremental.review_count, incremental.rating_sum, incremental.offer_count),
+            (rebuilt.business_profile_count, rebuilt.review_count, rebuilt.rating_sum, rebuilt.offer_count)
+        )
+
+
+    def test_get_base_info_rebuilds_missing_stats(self):
+        PlatformStats.objects.all().delete()
+        url = reverse('base-info')
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['business_profile_count'], 1)
+        self.assertEqual(response.data['offer_count'], 1)
+        self.assertTrue(PlatformStats.objects.exists())
@@ -2,8 +2,20 @@ from rest_framework.test import APITestCase, APIClient
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework import status
-from coderr_app.models import UserProfile, Offers, OfferDetails
+from coderr_app.models import UserProfile, Offers, OfferDetails, Orders
 from rest_framework.authtoken.models import Token
+from django.core.management import call_command
+from django.core.cache import caches
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from io import StringIO
+import json
+import csv
+import tempfile
+from unittest import mock
+from coderr_app.api.views import OffersViewSet
+from coderr_app.api.cache import get_cache, get_versions, invalidate_offers, offer_version_key, increment_counter, HITS_KEY, get_stats as get_offers_cache_stats
 
 
 class OffersTest(APITestCase):
@@ -189,7 +201,8 @@ class OffersTest(APITestCase):
         response = self.client.patch(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['title'], 'Online Marketing Paket Editing')
-        self.assertEqual(response.data['details'][0]['title'], 'Premium Online Marketing Editing')
+        details = {detail['offer_type']: detail for detail in response.data['details']}
+        self.assertEqual(details['premium']['title'], 'Premium Online Marketing Editing')
 
 
     def test_offer_patch_as_admin(self):
@@ -212,7 +225,8 @@ class OffersTest(APITestCase):
         response = self.client.patch(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['title'], 'Online Marketing Paket Editing')
-        self.assertEqual(response.data['details'][0]['title'], 'Premium Online Marketing Editing')
+        details = {detail['offer_type']: detail for detail in response.data['details']}
+        self.assertEqual(details['premium']['title'], 'Premium Online Marketing Editing')
 
 
     def test_offer_patch_as_customer(self):
@@ -356,4 +370,507 @@ class OffersTest(APITestCase):
 
         self.client.credentials()
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+    def test_offer_aggregates_are_stored(self):
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.min_delivery_time, 5)
+        self.assertEqual(self.offer.max_delivery_time, 10)
+
+
+    def test_offer_aggregates_after_detail_delete(self):
+        self.detail1.delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 200)
+        self.assertEqual(self.offer.min_delivery_time, 7)
+
+
+    def test_offer_aggregates_after_creation(self):
+        url = reverse('offers-list')
+        data = {
+            "title": "Online Marketing Paket",
+            "description": "Maximieren Sie Ihre Reichweite online.",
+            "details": [
+                {
+                    "title": "Basic Online Marketing",
+                    "revisions": 1,
+                    "delivery_time_in_days": 5,
+                    "price": 100.00,
+                    "features": ["1 Werbekampagne", "Woche"],
+                    "offer_type": "basic"
+                },
+                {
+                    "title": "Premium Online Marketing",
+                    "revisions": 5,
+                    "delivery_time_in_days": 30,
+                    "price": 500.00,
+                    "features": ["5 Werbekampagnen", "1 Monat", "Analyse"],
+                    "offer_type": "premium"
+                }
+            ]
+        }
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(float(response.data['min_price']), 100.00)
+        self.assertEqual(response.data['min_delivery_time'], 5)
+        self.assertEqual(response.data['max_delivery_time'], 30)
+
+
+    def test_filter_and_order_by_stored_aggregates(self):
+        cheap_offer = Offers.objects.create(user=self.user, title='Cheap', description='Cheap offer')
+        OfferDetails.objects.create(offer=cheap_offer, title='Cheap Basic', delivery_time_in_days=20, price=10.00, features=[], offer_type='basic')
+        url = reverse('offers-list')
+
+        response = self.client.get(url, {'ordering': 'min_price'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['id'], cheap_offer.id)
+
+        response = self.client.get(url, {'max_delivery_time': 7})
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.offer.id])
+
+
+    def test_check_offer_aggregates_command(self):
+        Offers.objects.filter(pk=self.offer.pk).update(min_price=1)
+        out = StringIO()
+        call_command('check_offer_aggregates', stdout=out)
+        self.assertIn(f'Offer {self.offer.pk}', out.getvalue())
+
+        call_command('check_offer_aggregates', '--fix', stdout=StringIO())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+
+
+
+    def test_offer_list_query_count_is_constant(self):
+        for index in range(100):
+            offer = Offers.objects.create(user=self.user, title=f'Offer {index}', description='Bulk offer')
+            OfferDetails.objects.create(offer=offer, title='Basic', delivery_time_in_days=3, price=50.00, features=[], offer_type='basic')
+            OfferDetails.objects.create(offer=offer, title='Premium', delivery_time_in_days=9, price=90.00, features=[], offer_type='premium')
+        url = reverse('offers-list')
+
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {'page_size': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 100)
+
+
+    def test_offer_detail_query_count(self):
+        url = reverse('offers-detail', kwargs={'pk': self.offer.id})
+
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['details']), 3)
+
+
+
+    def test_search_offers_with_prefix(self):
+        Offers.objects.create(user=self.user, title='Fotografie', description='Bilder für Webdesign Projekte')
+        webdesign = Offers.objects.create(user=self.user, title='Webdesign Paket', description='Moderne Webseiten')
+        url = reverse('offers-list')
+
+        response = self.client.get(url, {'search': 'webdes'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['results'][0]['id'], webdesign.id)
+
+        response = self.client.get(url, {'search': 'webdes', 'creator_id': self.customer.id})
+        self.assertEqual(response.data['count'], 0)
+
+
+    def test_search_index_follows_updates_and_deletes(self):
+        url = reverse('offers-list')
+        self.offer.title = 'Logodesign'
+        self.offer.save()
+
+        response = self.client.get(url, {'search': 'logo'})
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.offer.id])
+
+        self.offer.delete()
+        response = self.client.get(url, {'search': 'logo'})
+        self.assertEqual(response.data['count'], 0)
+
+
+    def test_search_matches_fts_index_once_per_query(self):
+        for index in range(5):
+            Offers.objects.create(user=self.user, title=f'Webdesign {index}', description='Moderne Webseiten')
+        url = reverse('offers-list')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'search': 'webdes'})
+        self.assertEqual(response.data['count'], 5)
+        search_queries = [query['sql'] for query in queries if 'MATCH' in query['sql']]
+        self.assertTrue(search_queries)
+
+        for sql in search_queries:
+            self.assertEqual(sql.count('MATCH'), 1)
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            self.assertNotIn('CORRELATED', plan)
+            self.assertEqual(plan.count('VIRTUAL TABLE INDEX'), 1)
+
+
+    def test_search_with_ordering(self):
+        second = Offers.objects.create(user=self.user, title='Testoffer Zwei', description='Testdescription')
+        OfferDetails.objects.create(offer=second, title='Basic', delivery_time_in_days=2, price=20.00, features=[], offer_type='basic')
+        url = reverse('offers-list')
+
+        response = self.client.get(url, {'search': 'test', 'ordering': 'min_price'})
+        self.assertEqual([offer['id'] for offer in response.data['results']], [second.id, self.offer.id])
+
+
+
+    def test_offer_list_cursor_pagination(self):
+        for index in range(7):
+            offer = Offers.objects.create(user=self.user, title=f'Offer {index}', description='Cursor offer')
+            OfferDetails.objects.create(offer=offer, title='Basic', delivery_time_in_days=3, price=100.00, features=[], offer_type='basic')
+        url = reverse('offers-list')
+
+        seen = []
+        params = {'pagination': 'cursor', 'page_size': 3, 'ordering': 'min_price'}
+        with self.assertNumQueries(3):
+            response = self.client.get(url, params)
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(offer['id'] for offer in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        expected = list(Offers.objects.order_by('min_price', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([offer['id'] for offer in response.data['results']], expected[3:6])
+
+
+    def test_offer_list_cursor_pagination_with_search(self):
+        cheap = Offers.objects.create(user=self.user, title='Webdesign Basis', description='Testdescription')
+        OfferDetails.objects.create(offer=cheap, title='Basic', delivery_time_in_days=3, price=20.00, features=[], offer_type='basic')
+        url = reverse('offers-list')
+
+        response = self.client.get(url, {'pagination': 'cursor', 'search': 'test'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', response.data)
+
+        response = self.client.get(url, {'pagination': 'cursor', 'search': 'test', 'ordering': 'min_price'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([offer['id'] for offer in response.data['results']], [cheap.id, self.offer.id])
+
+
+    def test_offer_list_invalid_cursor(self):
+        url = reverse('offers-list')
+        response = self.client.get(url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+
+
+    def test_offer_list_conditional_get(self):
+        url = reverse('offers-list')
+        response = self.client.get(url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = response['ETag']
+        Offers.objects.create(user=self.user, title='Neues Angebot', description='Neu')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+    def test_offer_list_etag_depends_on_page_and_ordering(self):
+        Offers.objects.create(user=self.user, title='Zweites Angebot', description='Zweites')
+        url = reverse('offers-list')
+        first_page = self.client.get(url, {'page_size': 1})
+        etags = {first_page['ETag']}
+        for params in ({'page_size': 1, 'page': 2}, {'page_size': 2}, {'page_size': 1, 'ordering': '-created_at'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params, HTTP_IF_NONE_MATCH=first_page['ETag'])
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                etags.add(response['ETag'])
+        self.assertEqual(len(etags), 4)
+
+        response = self.client.get(url, {'page_size': 1}, HTTP_IF_NONE_MATCH=first_page['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+    def test_offer_detail_conditional_get_after_detail_change(self):
+        url = reverse('offers-detail', kwargs={'pk': self.offer.id})
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Offers.objects.filter(pk=self.offer.pk).update(updated_at='2020-01-01T00:00:00Z')
+        self.detail1.features = ["Feature 1"]
+        self.detail1.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+    def test_offer_detail_if_modified_since(self):
+        url = reverse('offerdetails-detail', kwargs={'pk': self.detail1.id})
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+
+    def test_offer_patch_keeps_detail_ids_and_orders(self):
+        order = Orders.objects.create(
+            customer_user=self.customer,
+            business_user=self.user,
+            offer=self.offer,
+            offer_details=self.detail3,
+            title=self.offer.title,
+            revisions=self.detail3.revisions,
+            delivery_time_in_days=self.detail3.delivery_time_in_days,
+            price=self.detail3.price,
+            features=self.detail3.features,
+            offer_type=self.detail3.offer_type,
+            status='in_progress'
+        )
+        url = reverse('offers-detail', kwargs={'pk': self.offer.id})
+        data = {
+            "details": [
+                {"offer_type": "premium", "price": 450.00},
+                {"offer_type": "basic", "price": 100.00, "title": "Detail 1"}
+            ]
+        }
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        response = self.client.patch(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(detail['id'] for detail in response.data['details']),
+            sorted([self.detail1.id, self.detail2.id, self.detail3.id])
+        )
+        self.detail3.refresh_from_db()
+        self.assertEqual(self.detail3.price, 450)
+        self.assertEqual(self.detail3.title, 'Premium Design')
+        self.assertTrue(Orders.objects.filter(pk=order.pk).exists())
+
+
+    def test_offer_patch_adds_new_detail_type(self):
+        self.detail3.delete()
+        url = reverse('offers-detail', kwargs={'pk': self.offer.id})
+        data = {
+            "details": [
+                {"title": "Premium", "delivery_time_in_days": 20, "price": 900.00, "features": [], "offer_type": "premium"}
+            ]
+        }
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        response = self.client.patch(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['details']), 3)
+        self.assertEqual(response.data['max_delivery_time'], 20)
+
+
+
+    def test_bulk_import_offers(self):
+        url = reverse('offers-bulk')
+        detail = {"title": "Basic", "revisions": 1, "delivery_time_in_days": 4, "price": 80.00, "features": ["A"], "offer_type": "basic"}
+        lines = [
+            json.dumps({"title": "Bulk 1", "description": "Erstes Angebot", "details": [detail]}),
+            "",
+            json.dumps({"title": "Bulk 2", "description": "Ohne Details"}),
+            "kein json",
+            json.dumps({"title": "Bulk 3", "description": "Drittes Angebot", "details": [detail, dict(detail, offer_type="premium", price=200.00, delivery_time_in_days=9)]}),
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        response = self.client.post(url, data='\n'.join(lines), content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+        self.assertEqual([result['line'] for result in results], [1, 3, 4, 5])
+        self.assertEqual([result['status'] for result in results], ['created', 'error', 'error', 'created'])
+        self.assertIn('details', results[1]['errors'])
+
+        offer = Offers.objects.get(pk=results[3]['id'])
+        self.assertEqual(offer.user, self.user)
+        self.assertEqual(offer.details.count(), 2)
+        self.assertEqual(offer.min_price, 80)
+        self.assertEqual(offer.max_delivery_time, 9)
+
+
+    def test_bulk_import_as_customer(self):
+        url = reverse('offers-bulk')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.post(url, data='{}', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+
+    def test_export_offers_as_ndjson(self):
+        Offers.objects.create(user=self.user, title='Ohne Details', description='Leer')
+        url = reverse('offers-export')
+
+        response = self.client.get(url, {'format': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        offers = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([offer['title'] for offer in offers], ['Testoffer', 'Ohne Details'])
+        self.assertEqual(len(offers[0]['details']), 3)
+        self.assertEqual(float(offers[0]['min_price']), 100.00)
+
+
+    def test_export_offers_as_csv(self):
+        url = reverse('offers-export')
+
+        response = self.client.get(url, {'format': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode('utf-8').splitlines()))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row['offer_type'] for row in rows}, {'basic', 'standard', 'premium'})
+        self.assertEqual(rows[0]['min_price'], '100.00')
+
+
+class OffersCacheTest(APITestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        settings_override = override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'offers': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': self.cache_dir.name},
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='testuser', password='testpassword', email='test@test.de')
+        self.user_profile = UserProfile.objects.create(user=self.user, email=self.user.email, type='business')
+        self.admin = User.objects.create_superuser(username='admin', password='admin')
+
+        self.offer = Offers.objects.create(user=self.user, title='Testoffer', description='Testdescription')
+        self.detail = OfferDetails.objects.create(
+            offer=self.offer,
+            title='Detail 1',
+            revisions=2,
+            delivery_time_in_days=5,
+            price=100.00,
+            features=["Feature 1"],
+            offer_type='basic'
+        )
+        self.other_offer = Offers.objects.create(user=self.user, title='Other offer', description='Other description')
+
+        self.admin_token = Token.objects.create(user=self.admin)
+        self.client = APIClient()
+
+
+    def test_anonymous_list_is_cached(self):
+        url = reverse('offers-list')
+        first = self.client.get(url, {'ordering': 'min_price', 'search': ''})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {'search': '', 'ordering': 'min_price'})
+        self.assertEqual(first.data, second.data)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token.key)
+        response = self.client.get(reverse('offers-cache-stats'))
+        self.assertEqual(response.data, {'hits': 1, 'misses': 1})
+
+
+    def test_detail_change_invalidates_only_affected_offer(self):
+        url = reverse('offers-detail', kwargs={'pk': self.offer.id})
+        other_url = reverse('offers-detail', kwargs={'pk': self.other_offer.id})
+        self.client.get(url)
+        self.client.get(other_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.detail.features = ["Feature 1", "Feature 2"]
+            self.detail.save()
+
+        with self.assertNumQueries(0):
+            self.client.get(other_url)
+        response = self.client.get(url)
+        self.assertEqual(response.data['details'][0]['features'], ["Feature 1", "Feature 2"])
+
+
+    def test_price_change_invalidates_lists(self):
+        url = reverse('offers-list')
+        self.client.get(url, {'ordering': 'min_price'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.detail.price = 50.00
+            self.detail.save()
+
+        response = self.client.get(url, {'ordering': 'min_price'})
+        self.assertEqual(float(response.data['results'][-1]['min_price']), 50.00)
+
+
+    def test_user_name_change_invalidates_offers(self):
+        url = reverse('offers-detail', kwargs={'pk': self.offer.id})
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Neuer Name'
+            self.user.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['user_details']['first_name'], 'Neuer Name')
+
+
+
+    def test_cached_entry_answers_conditional_get(self):
+        url = reverse('offers-list')
+        response = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+    def test_invalidation_during_request_is_not_cached(self):
+        original_get_serializer = OffersViewSet.get_serializer
+
+        def get_serializer_and_invalidate(view, *args, **kwargs):
+            serializer = original_get_serializer(view, *args, **kwargs)
+            invalidate_offers([self.offer.id])
+            return serializer
+
+        for url in (reverse('offers-detail', kwargs={'pk': self.offer.id}), reverse('offers-list')):
+            with self.subTest(url=url):
+                get_cache().clear()
+                with mock.patch.object(OffersViewSet, 'get_serializer', get_serializer_and_invalidate):
+                    self.client.get(url)
+                self.client.get(url)
+                self.assertEqual(get_offers_cache_stats(), {'hits': 0, 'misses': 2})
+
+
+    def test_invalidation_reaches_other_workers(self):
+        other_worker_cache = caches.create_connection('offers')
+        key = offer_version_key(self.offer.id)
+        version = get_versions([key])[key]
+        self.assertEqual(other_worker_cache.get(key), version)
+
+        with mock.patch('coderr_app.api.cache.get_cache', return_value=other_worker_cache):
+            invalidate_offers([self.offer.id])
+            increment_counter(HITS_KEY)
+        self.assertIsNone(get_cache().get(key))
+        self.assertEqual(get_offers_cache_stats(), {'hits': 1, 'misses': 0})
+
+
+    def test_process_local_cache_is_not_used(self):
+        url = reverse('offers-detail', kwargs={'pk': self.offer.id})
+        with override_settings(OFFERS_CACHE_ALIAS='default'):
+            self.client.get(url)
+            with self.assertNumQueries(3):
+                self.client.get(url)
+            self.assertEqual(get_offers_cache_stats(), {'hits': 0, 'misses': 0})
@@ -0,0 +1,154 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from coderr_app.models import UserProfile, Offers, OfferDetails, OrderEventTicket
+from coderr_app.api.events import broker
+from rest_framework.authtoken.models import Token
+
+
+class OrderEventsTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create_user(username='testuser', password='testpassword', email='test@test.de')
+        self.user_profile = UserProfile.objects.create(user=self.business, email=self.business.email, type='business')
+        self.customer = User.objects.create_user(username='testcustomer', password='testpassword', email='customer@test.de')
+        self.user_profile_customer = UserProfile.objects.create(user=self.customer, email=self.customer.email, type='customer')
+        self.other_customer = User.objects.create_user(username='othercustomer', password='testpassword', email='other@test.de')
+        self.user_profile_other = UserProfile.objects.create(user=self.other_customer, email=self.other_customer.email, type='customer')
+
+        self.offer = Offers.objects.create(
+            user=self.business,
+            title='Testoffer',
+            description='Testdescription',
+        )
+        self.detail1 = OfferDetails.objects.create(
+            offer=self.offer,
+            title='Detail 1',
+            revisions=2,
+            delivery_time_in_days=5,
+            price=100.00,
+            features=["Feature 1", "Festure 2"],
+            offer_type='basic'
+        )
+
+        self.business_token = Token.objects.create(user=self.business)
+        self.customer_token = Token.objects.create(user=self.customer)
+        self.other_token = Token.objects.create(user=self.other_customer)
+        self.client = APIClient()
+        self.url = reverse('order-events')
+
+
+    def post_order(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('orders-list'), {'offer_detail_id': self.detail1.id}, format='json')
+
+
+    def patch_order(self, order_id, status):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(reverse('orders-detail', kwargs={'pk': order_id}), {'status': status}, format='json')
+
+
+    async def subscribe(self, token):
+        response = await self.async_client.get(self.url, headers={'Authorization': f'Token {token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        return response, stream
+
+
+    async def next_event(self, stream, timeout=5):
+        chunk = (await asyncio.wait_for(anext(stream), timeout)).decode()
+        lines = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+        return lines['event'], json.loads(lines['data'])
+
+
+    async def test_many_concurrent_subscribers_receive_events(self):
+        subscribers = await asyncio.gather(*(
+            self.subscribe(self.business_token.key if index % 2 else self.customer_token.key) for index in range(50)
+        ))
+        outsider_response, outsider_stream = await self.subscribe(self.other_token.key)
+        self.assertEqual(broker.subscriber_count(), 51)
+
+        response = await sync_to_async(self.post_order)()
+        order_id = response.data['id']
+        events = await asyncio.gather(*(self.next_event(stream) for _, stream in subscribers))
+        self.assertEqual({(event, data['id']) for event, data in events}, {('order.created', order_id)})
+
+        await sync_to_async(self.patch_order)(order_id, 'completed')
+        events = await asyncio.gather(*(self.next_event(stream) for _, stream in subscribers))
+        self.assertTrue(all(event == 'order.status_changed' for event, _ in events))
+        self.assertTrue(all((data['status'], data['previous_status']) == ('completed', 'in_progress') for _, data in events))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(anext(outsider_stream), 0.2)
+
+        for response, _ in subscribers + [(outsider_response, outsider_stream)]:
+            await sync_to_async(response.close)()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+
+    def issue_ticket(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        response = self.client.post(reverse('order-event-ticket'))
+        self.assertEqual(response.status_code, 201)
+        return response.data['ticket']
+
+
+    async def test_subscribe_with_single_use_ticket(self):
+        ticket = await sync_to_async(self.issue_ticket)(self.business_token.key)
+        response = await self.async_client.get(self.url, {'ticket': ticket})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(broker.subscriber_count(), 1)
+        await sync_to_async(response.close)()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+        response = await self.async_client.get(self.url, {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+
+    async def test_subscribe_rejects_expired_ticket_and_query_token(self):
+        ticket = await sync_to_async(self.issue_ticket)(self.business_token.key)
+        await OrderEventTicket.objects.filter(key=ticket).aupdate(expires_at=timezone.now())
+        response = await self.async_client.get(self.url, {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get(self.url, {'token': self.business_token.key})
+        self.assertEqual(response.status_code, 401)
+
+
+    def test_issue_ticket_as_unauthorized(self):
+        response = self.client.post(reverse('order-event-ticket'))
+        self.assertEqual(response.status_code, 401)
+
+
+    async def test_subscribe_as_unauthorized(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(self.url, headers={'Authorization': 'Token invalid'})
+        self.assertEqual(response.status_code, 401)
+
+
+    async def test_bulk_status_publishes_events(self):
+        response, stream = await self.subscribe(self.customer_token.key)
+        order_ids = [(await sync_to_async(self.post_order)()).data['id'] for _ in range(2)]
+        for _ in order_ids:
+            await self.next_event(stream)
+
+        def patch_bulk_status():
+            self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+            with self.captureOnCommitCallbacks(execute=True):
+                return self.client.patch(reverse('orders-bulk-status'), {'ids': order_ids, 'status': 'cancelled'}, format='json')
+
+        await sync_to_async(patch_bulk_status)()
+        events = [await self.next_event(stream) for _ in order_ids]
+        self.assertEqual([(event, data['id'], data['status']) for event, data in events], [
+            ('order.status_changed', order_id, 'cancelled') for order_id in order_ids
+        ])
+        await sync_to_async(response.close)()
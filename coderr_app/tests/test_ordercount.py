@@ -1,8 +1,10 @@
 from rest_framework.test import APITestCase, APIClient
 from django.contrib.auth.models import User
 from django.urls import reverse
+from io import StringIO
 from rest_framework import status
-from coderr_app.models import UserProfile, Offers, OfferDetails, Orders
+from django.core.management import call_command
+from coderr_app.models import UserProfile, Offers, OfferDetails, Orders, OrderStatusCounter
 from rest_framework.authtoken.models import Token
 
 
@@ -160,4 +162,136 @@ class OrderCountTest(APITestCase):
 
         self.client.credentials()
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_count_order_reads_single_row(self):
+        url = reverse('order-count', kwargs={'business_user_id': self.business.id})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['order_count'], 2)
+
+
+    def test_count_order_recomputes_missing_counter(self):
+        OrderStatusCounter.objects.filter(business_user=self.business).delete()
+        url = reverse('completed-order-count', kwargs={'business_user_id': self.business.id})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['completed_order_count'], 1)
+        counter = OrderStatusCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed), (2, 1))
+
+
+    def test_rebuild_for_keeps_existing_counter(self):
+        OrderStatusCounter.objects.filter(business_user=self.business).update(in_progress=7)
+
+        counter = OrderStatusCounter.objects.rebuild_for(self.business.id)
+        self.assertEqual(counter.in_progress, 7)
+        self.assertEqual(OrderStatusCounter.objects.get(business_user=self.business).in_progress, 7)
+
+
+    def test_count_order_for_business_without_orders(self):
+        business = User.objects.create_user(username='newbusiness', password='testpassword')
+        UserProfile.objects.create(user=business, email='new@test.de', type='business')
+        url = reverse('completed-order-count', kwargs={'business_user_id': business.id})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['completed_order_count'], 0)
+
+
+    def test_count_order_for_non_business_user(self):
+        url = reverse('order-count', kwargs={'business_user_id': self.customer.id})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_counters_follow_status_changes(self):
+        url = reverse('orders-detail', kwargs={'pk': self.order1.pk})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        response = self.client.patch(url, {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counter = OrderStatusCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (1, 2, 0))
+
+        url = reverse('orders-detail', kwargs={'pk': self.order2.pk})
+        response = self.client.patch(url, {'status': 'cancelled'}, format='json')
+        counter.refresh_from_db()
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (0, 2, 1))
+
+        self.order3.delete()
+        counter.refresh_from_db()
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (0, 1, 1))
+
+
+    def test_counters_follow_order_creation(self):
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.post(url, {'offer_detail_id': self.detail1.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(OrderStatusCounter.objects.get(business_user=self.business).in_progress, 3)
+
+
+    def test_rebuild_order_status_counters(self):
+        OrderStatusCounter.objects.filter(business_user=self.business).update(in_progress=10, completed=0)
+        Orders.objects.filter(pk=self.order2.pk).update(status='cancelled')
+
+        out = StringIO()
+        call_command('rebuild_order_status_counters', stdout=out)
+        counter = OrderStatusCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (1, 1, 1))
+        self.assertIn('1 Bestellzähler', out.getvalue())
+
+
+
+    def test_order_counts_for_many_businesses(self):
+        business = User.objects.create_user(username='newbusiness', password='testpassword')
+        UserProfile.objects.create(user=business, email='new@test.de', type='business')
+        url = reverse('order-counts')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'business_user_ids': f'{self.business.id},{business.id}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            str(self.business.id): {'order_count': 2, 'completed_order_count': 1},
+            str(business.id): {'order_count': 0, 'completed_order_count': 0},
+        })
+
+
+    def test_order_counts_rejects_non_business_ids(self):
+        url = reverse('order-counts')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url, {'business_user_ids': f'{self.business.id},{self.customer.id}'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['business_user_ids'], [self.customer.id])
+
+
+    def test_order_counts_rejects_invalid_ids(self):
+        url = reverse('order-counts')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'business_user_ids': '1,abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'business_user_ids': ','.join(str(i) for i in range(1, 502))})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_order_counts_as_unauthorized(self):
+        url = reverse('order-counts')
+
+        self.client.credentials()
+        response = self.client.get(url, {'business_user_ids': str(self.business.id)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
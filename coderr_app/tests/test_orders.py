@@ -1,8 +1,15 @@
+from datetime import timedelta
 from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
-from coderr_app.models import UserProfile, Offers, OfferDetails
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from io import StringIO
+from coderr_app.models import UserProfile, Offers, OfferDetails, Orders, OrdersArchive, OrderStatusCounter, FeatureSnapshot
 from rest_framework.authtoken.models import Token
 
 
@@ -336,4 +343,312 @@ class OrdersTest(APITestCase):
         self.client.credentials()
         response_get = self.client.delete(url_delete)
         self.assertEqual(response_post.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response_get.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response_get.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def create_order(self, detail, status='in_progress'):
+        return Orders.objects.create(
+            customer_user=self.customer,
+            business_user=self.business,
+            offer=self.offer,
+            offer_details=detail,
+            title=self.offer.title,
+            revisions=detail.revisions,
+            delivery_time_in_days=detail.delivery_time_in_days,
+            price=detail.price,
+            features=detail.features,
+            offer_type=detail.offer_type,
+            status=status
+        )
+
+
+    def test_get_orders_query_count_is_constant(self):
+        for _ in range(20):
+            self.create_order(self.detail1)
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'page_size': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 20)
+
+
+    def test_get_order_returns_paid_price(self):
+        order = self.create_order(self.detail2)
+        self.detail2.price = 999.00
+        self.detail2.features = ["Neu"]
+        self.detail2.save()
+        url = reverse('orders-detail', kwargs={'pk': order.pk})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['price'], '200.00')
+        self.assertEqual(response.data['features'], ["Logo Design", "Visitenkarte", "Briefpapier"])
+        self.assertEqual(response.data['title'], 'Testoffer')
+
+
+    def test_get_orders_cursor_pagination(self):
+        orders = [self.create_order(self.detail1) for _ in range(8)]
+        expected_ids = [order.id for order in reversed(orders)]
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        first_page = self.client.get(url)
+        self.assertEqual(first_page.status_code, status.HTTP_200_OK)
+        self.assertEqual([order['id'] for order in first_page.data['results']], expected_ids[:6])
+        self.assertIsNone(first_page.data['previous'])
+
+        second_page = self.client.get(first_page.data['next'])
+        self.assertEqual([order['id'] for order in second_page.data['results']], expected_ids[6:])
+        self.assertIsNone(second_page.data['next'])
+
+        previous_page = self.client.get(second_page.data['previous'])
+        self.assertEqual([order['id'] for order in previous_page.data['results']], expected_ids[:6])
+
+
+    def test_get_orders_only_own_orders(self):
+        other_customer = User.objects.create_user(username='othercustomer', password='testpassword')
+        UserProfile.objects.create(user=other_customer, email='other@test.de', type='customer')
+        own_order = self.create_order(self.detail1)
+        other_order = self.create_order(self.detail2)
+        other_order.customer_user = other_customer
+        other_order.save()
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url)
+        self.assertEqual([order['id'] for order in response.data['results']], [own_order.id])
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        response = self.client.get(url)
+        self.assertEqual([order['id'] for order in response.data['results']], [other_order.id, own_order.id])
+
+
+    def test_get_orders_as_customer_and_business_without_duplicates(self):
+        orders = [self.create_order(self.detail1) for _ in range(4)]
+        own_order = orders[1]
+        own_order.customer_user = self.business
+        own_order.save()
+        customer_order = Orders.objects.create(
+            customer_user=self.business,
+            business_user=self.admin,
+            offer=self.offer,
+            offer_details=self.detail2,
+            title=self.detail2.title,
+            revisions=self.detail2.revisions,
+            delivery_time_in_days=self.detail2.delivery_time_in_days,
+            price=self.detail2.price,
+            features=self.detail2.features,
+            offer_type=self.detail2.offer_type,
+            status='in_progress'
+        )
+        expected_ids = [customer_order.id] + [order.id for order in reversed(orders)]
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        first_page = self.client.get(url, {'page_size': 3})
+        second_page = self.client.get(first_page.data['next'])
+        self.assertEqual([order['id'] for order in first_page.data['results']], expected_ids[:3])
+        self.assertEqual([order['id'] for order in second_page.data['results']], expected_ids[3:])
+        self.assertIsNone(second_page.data['next'])
+
+
+    def test_get_orders_uses_composite_indexes_without_sort(self):
+        for _ in range(8):
+            self.create_order(self.detail1)
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        with CaptureQueriesContext(connection) as queries:
+            first_page = self.client.get(url)
+            self.client.get(first_page.data['next'])
+        order_queries = [query['sql'] for query in queries if 'FROM "coderr_app_orders"' in query['sql']]
+        self.assertEqual(len(order_queries), 4)
+
+        plans = []
+        for sql in order_queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            self.assertNotIn('TEMP B-TREE', plan)
+            self.assertNotIn('MULTI-INDEX OR', plan)
+            plans.append(plan)
+        for index_name in ('orders_customer_created_idx', 'orders_business_created_idx'):
+            self.assertEqual(sum(index_name in plan for plan in plans), 2)
+
+
+    def test_get_orders_filters(self):
+        basic_order = self.create_order(self.detail1)
+        premium_order = self.create_order(self.detail3, status='completed')
+        old_order = self.create_order(self.detail3)
+        Orders.objects.filter(pk=old_order.pk).update(created_at=timezone.now() - timedelta(days=30))
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        response = self.client.get(url, {'status': 'completed'})
+        self.assertEqual([order['id'] for order in response.data['results']], [premium_order.id])
+
+        response = self.client.get(url, {'offer_type': 'premium'})
+        self.assertEqual([order['id'] for order in response.data['results']], [premium_order.id, old_order.id])
+
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.get(url, {'created_at_after': since})
+        self.assertEqual([order['id'] for order in response.data['results']], [premium_order.id, basic_order.id])
+
+        response = self.client.get(url, {'created_at_before': since})
+        self.assertEqual([order['id'] for order in response.data['results']], [old_order.id])
+
+
+    def test_post_order_resolves_offer_in_one_query(self):
+        self.create_order(self.detail2)
+        url = reverse('orders-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        # Token mit Profil, Savepoint, Detail mit Angebot und Anbieter, Feature-Snapshot, Insert, Zähler, Rollup, Release
+        with self.assertNumQueries(8):
+            response = self.client.post(url, {'offer_detail_id': self.detail2.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Orders.objects.get(pk=response.data['id']).business_user, self.business)
+
+
+    def test_patch_bulk_status_as_business(self):
+        other_business = User.objects.create_user(username='otherbusiness', password='testpassword')
+        UserProfile.objects.create(user=other_business, email='other@test.de', type='business')
+        order1 = self.create_order(self.detail1)
+        order2 = self.create_order(self.detail2)
+        completed_order = self.create_order(self.detail3, status='completed')
+        foreign_order = self.create_order(self.detail1)
+        foreign_order.business_user = other_business
+        foreign_order.save()
+        url = reverse('orders-bulk-status')
+        data = {'ids': [order1.id, order2.id, completed_order.id, foreign_order.id, 9999], 'status': 'completed'}
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        response = self.client.patch(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], [order1.id, order2.id])
+        self.assertEqual(response.data['skipped'], [
+            {'id': completed_order.id, 'reason': 'unchanged'},
+            {'id': foreign_order.id, 'reason': 'not_owner'},
+            {'id': 9999, 'reason': 'not_found'},
+        ])
+        self.assertEqual(Orders.objects.filter(status='completed').count(), 3)
+        self.assertGreater(Orders.objects.get(pk=order1.pk).updated_at, order1.updated_at)
+
+        counter = OrderStatusCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed), (0, 3))
+
+
+    def test_patch_bulk_status_query_count(self):
+        orders = [self.create_order(self.detail1) for _ in range(10)]
+        self.create_order(self.detail1, status='cancelled')
+        url = reverse('orders-bulk-status')
+        data = {'ids': [order.id for order in orders], 'status': 'cancelled'}
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        # Token, Savepoint, Select, Update, je zwei Zähler- und Rollup-Updates, Release
+        with self.assertNumQueries(9):
+            response = self.client.patch(url, data, format='json')
+        self.assertEqual(len(response.data['updated']), 10)
+
+
+    def test_patch_bulk_status_invalid_data(self):
+        url = reverse('orders-bulk-status')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        response = self.client.patch(url, {'ids': [1], 'status': 'unknown'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(url, {'ids': [], 'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_patch_bulk_status_as_customer(self):
+        order = self.create_order(self.detail1)
+        url = reverse('orders-bulk-status')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.patch(url, {'ids': [order.id], 'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+    def create_archivable_orders(self):
+        old = timezone.now() - timedelta(days=365)
+        orders = {
+            'old_completed': self.create_order(self.detail1, status='completed'),
+            'old_cancelled': self.create_order(self.detail2, status='cancelled'),
+            'old_in_progress': self.create_order(self.detail1),
+            'recent_completed': self.create_order(self.detail3, status='completed'),
+            'newest': self.create_order(self.detail3, status='completed'),
+        }
+        Orders.objects.exclude(pk=orders['recent_completed'].pk).update(updated_at=old)
+        return orders
+
+
+    def test_archive_orders_command(self):
+        orders = self.create_archivable_orders()
+
+        out = StringIO()
+        call_command('archive_orders', days=180, batch_size=1, stdout=out)
+        self.assertIn('3 Bestellung(en) ins Archiv verschoben.', out.getvalue())
+        self.assertEqual(
+            set(OrdersArchive.objects.values_list('id', flat=True)),
+            {orders['old_completed'].id, orders['old_cancelled'].id, orders['newest'].id}
+        )
+        self.assertEqual(
+            set(Orders.objects.values_list('id', flat=True)),
+            {orders['old_in_progress'].id, orders['recent_completed'].id}
+        )
+        self.assertGreater(self.create_order(self.detail1).id, orders['newest'].id)
+        archived = OrdersArchive.objects.get(pk=orders['old_cancelled'].id)
+        self.assertEqual((archived.price, archived.status, archived.business_user), (orders['old_cancelled'].price, 'cancelled', self.business))
+
+
+    def test_benchmark_refuses_live_database(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_order_create', requests=1, threads=1, stdout=StringIO())
+        self.assertFalse(User.objects.filter(username__startswith='bench-').exists())
+
+
+    def test_archived_orders_stay_counted(self):
+        self.create_archivable_orders()
+        call_command('archive_orders', stdout=StringIO())
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(reverse('completed-order-count', kwargs={'business_user_id': self.business.id}))
+        self.assertEqual(response.data['completed_order_count'], 3)
+        self.assertEqual(OrdersArchive.objects.count(), 3)
+
+        call_command('rebuild_order_status_counters', stdout=StringIO())
+        counter = OrderStatusCounter.objects.get(business_user=self.business)
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (1, 3, 1))
+
+
+    def test_get_archived_order_detail(self):
+        orders = self.create_archivable_orders()
+        call_command('archive_orders', stdout=StringIO())
+        url = reverse('orders-detail', kwargs={'pk': orders['old_completed'].id})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], orders['old_completed'].id)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['price'], '100.00')
+
+        other_customer = User.objects.create_user(username='othercustomer', password='testpassword')
+        UserProfile.objects.create(user=other_customer, email='other@test.de', type='customer')
+        other_token = Token.objects.create(user=other_customer)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + other_token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    def test_orders_share_feature_snapshots(self):
+        orders = [self.create_order(self.detail2) for _ in range(3)]
+        self.create_order(self.detail1)
+
+        self.assertEqual(FeatureSnapshot.objects.count(), 2)
+        self.assertEqual(len({order.features_snapshot_id for order in orders}), 1)
+        self.assertEqual(Orders.objects.get(pk=orders[0].pk).features, ["Logo Design", "Visitenkarte", "Briefpapier"])
@@ -113,3 +113,30 @@ class ProfileDetailTest(APITestCase):
         response = self.client.patch(url, data)
         
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_get_profile_details_conditional(self):
+        url = reverse('profile-detail', kwargs={'pk': self.user_profile_2.pk})
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token_user_2.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+    def test_get_profile_lists_constant_queries(self):
+        for index in range(3):
+            business = User.objects.create_user(username=f'business{index}', password='testpassword')
+            UserProfile.objects.create(user=business, email=f'business{index}@test.de', type='business')
+            customer = User.objects.create_user(username=f'customer{index}', password='testpassword')
+            UserProfile.objects.create(user=customer, email=f'customer{index}@test.de', type='customer')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token_user.key)
+        for url_name, profile_count in (('business-profiles-list', 5), ('customer-profiles-list', 3)):
+            with self.subTest(url_name=url_name):
+                with self.assertNumQueries(2):
+                    response = self.client.get(reverse(url_name))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(response.data), profile_count)
@@ -0,0 +1,174 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from coderr_app.models import UserProfile, Offers, OfferDetails, Orders, RevenueRollup
+from rest_framework.authtoken.models import Token
+
+
+class RevenueTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create_user(username='testuser', password='testpassword', email='test@test.de')
+        self.user_profile = UserProfile.objects.create(user=self.business, email=self.business.email, type='business')
+        self.admin = User.objects.create_superuser(username='admin', password='admin', email='admin@test.de')
+        self.user_profile_admin = UserProfile.objects.create(user=self.admin, email=self.admin.email, type='staff')
+        self.customer = User.objects.create_user(username='testcustomer', password='testpassword', email='customer@test.de')
+        self.user_profile_customer = UserProfile.objects.create(user=self.customer, email=self.customer.email, type='customer')
+
+        self.offer = Offers.objects.create(
+            user=self.business,
+            title='Testoffer',
+            description='Testdescription',
+        )
+        self.detail1 = OfferDetails.objects.create(
+            offer=self.offer,
+            title='Detail 1',
+            revisions=2,
+            delivery_time_in_days=5,
+            price=100.00,
+            features=["Feature 1", "Festure 2"],
+            offer_type='basic'
+        )
+        self.detail2 = OfferDetails.objects.create(
+            offer=self.offer,
+            title='Standard Design',
+            revisions=5,
+            delivery_time_in_days=7,
+            price=250.00,
+            features=["Logo Design", "Visitenkarte", "Briefpapier"],
+            offer_type='standard'
+        )
+
+        self.business_token = Token.objects.create(user=self.business)
+        self.admin_token = Token.objects.create(user=self.admin)
+        self.customer_token = Token.objects.create(user=self.customer)
+        self.client = APIClient()
+        self.url = reverse('business-revenue', kwargs={'business_user_id': self.business.id})
+
+
+    def create_order(self, detail, status='in_progress', days_ago=0):
+        order = Orders.objects.create(
+            customer_user=self.customer,
+            business_user=self.business,
+            offer=self.offer,
+            offer_details=detail,
+            title=self.offer.title,
+            revisions=detail.revisions,
+            delivery_time_in_days=detail.delivery_time_in_days,
+            price=detail.price,
+            features=detail.features,
+            offer_type=detail.offer_type,
+            status=status
+        )
+        if days_ago:
+            created_at = order.created_at - timedelta(days=days_ago)
+            Orders.objects.filter(pk=order.pk).update(created_at=created_at)
+            RevenueRollup.objects.rebuild()
+            order.refresh_from_db()
+        return order
+
+
+    def rollup(self, status, day=None):
+        rollup = RevenueRollup.objects.get(business_user=self.business, day=day or timezone.localdate(), status=status)
+        return rollup.order_count, rollup.price_sum
+
+
+    def test_rollups_follow_order_creation_and_status(self):
+        url = reverse('orders-list')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        self.client.post(url, {'offer_detail_id': self.detail1.id}, format='json')
+        response = self.client.post(url, {'offer_detail_id': self.detail2.id}, format='json')
+        self.assertEqual(self.rollup('in_progress'), (2, Decimal('350.00')))
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        self.client.patch(reverse('orders-detail', kwargs={'pk': response.data['id']}), {'status': 'completed'}, format='json')
+        self.assertEqual(self.rollup('in_progress'), (1, Decimal('100.00')))
+        self.assertEqual(self.rollup('completed'), (1, Decimal('250.00')))
+
+
+    def test_rollups_follow_bulk_status_and_delete(self):
+        order1 = self.create_order(self.detail1)
+        order2 = self.create_order(self.detail2)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        self.client.patch(reverse('orders-bulk-status'), {'ids': [order1.id, order2.id], 'status': 'cancelled'}, format='json')
+        self.assertEqual(self.rollup('in_progress'), (0, Decimal('0.00')))
+        self.assertEqual(self.rollup('cancelled'), (2, Decimal('350.00')))
+
+        Orders.objects.get(pk=order2.pk).delete()
+        self.assertEqual(self.rollup('cancelled'), (1, Decimal('100.00')))
+
+
+    def test_rollups_never_drop_below_zero_after_drift(self):
+        order1 = self.create_order(self.detail1)
+        order2 = self.create_order(self.detail2)
+        RevenueRollup.objects.filter(business_user=self.business).update(order_count=0)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        response = self.client.patch(reverse('orders-detail', kwargs={'pk': order1.id}), {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        Orders.objects.get(pk=order2.pk).delete()
+        self.assertEqual(self.rollup('in_progress')[0], 0)
+        self.assertEqual(self.rollup('completed'), (1, Decimal('100.00')))
+
+
+    def test_get_revenue_by_day_and_month(self):
+        self.create_order(self.detail1, status='completed')
+        self.create_order(self.detail2, status='completed')
+        self.create_order(self.detail2, status='completed', days_ago=40)
+        self.create_order(self.detail1)
+        today = timezone.localdate()
+        old_day = today - timedelta(days=40)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'period': old_day.isoformat(), 'status': 'completed', 'order_count': 1, 'revenue': '250.00'},
+            {'period': today.isoformat(), 'status': 'completed', 'order_count': 2, 'revenue': '350.00'},
+            {'period': today.isoformat(), 'status': 'in_progress', 'order_count': 1, 'revenue': '100.00'},
+        ])
+
+        response = self.client.get(self.url, {'granularity': 'month', 'from': (today - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.data['results'], [
+            {'period': today.strftime('%Y-%m'), 'status': 'completed', 'order_count': 2, 'revenue': '350.00'},
+            {'period': today.strftime('%Y-%m'), 'status': 'in_progress', 'order_count': 1, 'revenue': '100.00'},
+        ])
+
+        response = self.client.get(self.url, {'to': old_day.isoformat()})
+        self.assertEqual(len(response.data['results']), 1)
+
+
+    def test_get_revenue_invalid_params(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.business_token.key)
+        self.assertEqual(self.client.get(self.url, {'granularity': 'year'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'from': '2026-13-01'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'to': 'gestern'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_get_revenue_permissions(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.admin_token.key)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.client.credentials()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_rebuild_revenue_rollups(self):
+        self.create_order(self.detail1, status='completed')
+        self.create_order(self.detail2, status='completed')
+        RevenueRollup.objects.update(order_count=99, price_sum=0)
+
+        out = StringIO()
+        call_command('rebuild_revenue_rollups', chunk_size=1, stdout=out)
+        self.assertEqual(self.rollup('completed'), (2, Decimal('350.00')))
+        self.assertIn('1 Umsatz-Rollup(s)', out.getvalue())
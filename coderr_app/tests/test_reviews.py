@@ -1,8 +1,10 @@
 from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework import status
-from coderr_app.models import UserProfile, Offers, OfferDetails, Orders
+from coderr_app.models import UserProfile, Offers, OfferDetails, Orders, Reviews, BusinessRatingSummary
 from rest_framework.authtoken.models import Token
 
 
@@ -315,4 +317,163 @@ class ReviewTests(APITestCase):
         self.assertEqual(response_post.data['description'], 'Alles Toll')
         self.client.credentials()
         response_delete = self.client.delete(url_delete)
-        self.assertEqual(response_delete.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response_delete.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_rating_summary_follows_review_changes(self):
+        url_post = reverse('reviews-list')
+        data = {
+            "rating": 5,
+            "description": "Alles Toll",
+            "business_user": self.business.id
+        }
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response_post = self.client.post(url_post, data, format='json')
+        self.assertEqual(response_post.status_code, status.HTTP_201_CREATED)
+        Reviews.objects.create(business_user=self.business, customer_user=self.admin, rating=2, description='Ging so...')
+        summary = BusinessRatingSummary.objects.get(business_user=self.business)
+        self.assertEqual((summary.review_count, summary.average_rating), (2, 3.5))
+        self.assertEqual(summary.histogram, {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1})
+
+        url_detail = reverse('reviews-detail', kwargs={'pk': response_post.data['id']})
+        response_patch = self.client.patch(url_detail, {"rating": 4}, format='json')
+        self.assertEqual(response_patch.status_code, status.HTTP_200_OK)
+        summary.refresh_from_db()
+        self.assertEqual((summary.review_count, summary.average_rating), (2, 3.0))
+        self.assertEqual(summary.histogram, {'1': 0, '2': 1, '3': 0, '4': 1, '5': 0})
+
+        response_delete = self.client.delete(url_detail)
+        self.assertEqual(response_delete.status_code, status.HTTP_204_NO_CONTENT)
+        summary.refresh_from_db()
+        self.assertEqual((summary.review_count, summary.average_rating), (1, 2.0))
+        self.assertEqual(summary.histogram, {'1': 0, '2': 1, '3': 0, '4': 0, '5': 0})
+
+
+    def test_business_profiles_include_rating_summary(self):
+        other_business = User.objects.create_user(username='otherbusiness', password='testpassword')
+        UserProfile.objects.create(user=other_business, email='other@test.de', type='business')
+        Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=4, description='Gut')
+        url = reverse('business-profiles-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summaries = {profile['pk']: profile['rating_summary'] for profile in response.data}
+        self.assertEqual(summaries[self.business.id], {
+            'review_count': 1,
+            'average_rating': 4.0,
+            'histogram': {'1': 0, '2': 0, '3': 0, '4': 1, '5': 0}
+        })
+        self.assertEqual(summaries[other_business.id]['review_count'], 0)
+        self.assertEqual(summaries[other_business.id]['average_rating'], 0)
+
+
+    def test_rebuild_matches_incremental_rating_summaries(self):
+        review = Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=3, description='Mittel')
+        Reviews.objects.create(business_user=self.business, customer_user=self.admin, rating=5, description='Top')
+        review = Reviews.objects.get(pk=review.pk)
+        review.rating = 1
+        review.save()
+        incremental = BusinessRatingSummary.objects.get(business_user=self.business)
+
+        BusinessRatingSummary.objects.rebuild()
+        rebuilt = BusinessRatingSummary.objects.get(business_user=self.business)
+        self.assertEqual(
+            (incremental.review_count, incremental.rating_sum, incremental.histogram),
+            (rebuilt.review_count, rebuilt.rating_sum, rebuilt.histogram)
+        )
+
+
+    def test_get_reviews_cursor_pagination(self):
+        reviews = [
+            Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=rating, description='Test')
+            for rating in (3, 5, 1, 3, 4, 2, 5, 3)
+        ]
+        expected_ids = [review.id for review in sorted(reviews, key=lambda review: (review.rating, review.id))]
+        url = reverse('reviews-list')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        first_page = self.client.get(url, {'business_user_id': self.business.id, 'ordering': 'rating'})
+        self.assertEqual(first_page.status_code, status.HTTP_200_OK)
+        self.assertEqual([review['id'] for review in first_page.data['results']], expected_ids[:6])
+        self.assertIsNone(first_page.data['previous'])
+
+        second_page = self.client.get(first_page.data['next'])
+        self.assertEqual([review['id'] for review in second_page.data['results']], expected_ids[6:])
+        self.assertIsNone(second_page.data['next'])
+
+        previous_page = self.client.get(second_page.data['previous'])
+        self.assertEqual([review['id'] for review in previous_page.data['results']], expected_ids[:6])
+
+
+    def test_get_reviews_uses_index_without_sort(self):
+        for rating in (1, 2, 3, 4, 5, 4, 3, 2):
+            Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=rating, description='Test')
+        url = reverse('reviews-list')
+        cases = [
+            ({'business_user_id': self.business.id}, 'reviews_business_updated_idx'),
+            ({'business_user_id': self.business.id, 'ordering': 'rating'}, 'reviews_business_rating_idx'),
+            ({'business_user_id': self.business.id, 'ordering': '-rating'}, 'reviews_business_rating_idx'),
+            ({'reviewer_id': self.customer.id}, 'reviews_customer_updated_idx'),
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        for params, index_name in cases:
+            with self.subTest(params=params):
+                with CaptureQueriesContext(connection) as queries:
+                    first_page = self.client.get(url, params)
+                    self.client.get(first_page.data['next'])
+                review_queries = [query['sql'] for query in queries if 'FROM "coderr_app_reviews"' in query['sql']]
+                self.assertEqual(len(review_queries), 2)
+                for sql in review_queries:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                        plan = ' '.join(row[-1] for row in cursor.fetchall())
+                    self.assertIn(index_name, plan)
+                    self.assertNotIn('TEMP B-TREE', plan)
+
+
+    def test_get_top_reviews_per_business(self):
+        other_business = User.objects.create_user(username='otherbusiness', password='testpassword')
+        UserProfile.objects.create(user=other_business, email='other@test.de', type='business')
+        empty_business = User.objects.create_user(username='emptybusiness', password='testpassword')
+        UserProfile.objects.create(user=empty_business, email='empty@test.de', type='business')
+        own_reviews = [
+            Reviews.objects.create(business_user=self.business, customer_user=self.customer, rating=rating, description='Test')
+            for rating in (2, 5, 4, 5, 1)
+        ]
+        other_reviews = [
+            Reviews.objects.create(business_user=other_business, customer_user=self.customer, rating=rating, description='Test')
+            for rating in (3, 4)
+        ]
+        url = reverse('reviews-top')
+        business_user_ids = f'{self.business.id},{other_business.id},{empty_business.id}'
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'business_user_ids': business_user_ids, 'limit': 3, 'ordering': '-rating'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [review['id'] for review in response.data[str(self.business.id)]],
+            [own_reviews[3].id, own_reviews[1].id, own_reviews[2].id]
+        )
+        self.assertEqual([review['id'] for review in response.data[str(other_business.id)]], [other_reviews[1].id, other_reviews[0].id])
+        self.assertEqual(response.data[str(empty_business.id)], [])
+
+        response = self.client.get(url, {'business_user_ids': business_user_ids, 'limit': 2})
+        self.assertEqual(
+            [review['id'] for review in response.data[str(self.business.id)]],
+            [own_reviews[4].id, own_reviews[3].id]
+        )
+
+
+    def test_get_top_reviews_invalid_parameters(self):
+        url = reverse('reviews-top')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.customer_token.key)
+        for params in ({}, {'business_user_ids': 'a,b'}, {'business_user_ids': self.business.id, 'limit': 0},
+                       {'business_user_ids': self.business.id, 'ordering': 'description'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
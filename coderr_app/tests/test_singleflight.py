@@ -0,0 +1,117 @@
+import tempfile
+import threading
+import time
+from unittest import mock, skipUnless
+from django.test import SimpleTestCase, override_settings
+from coderr_app.api.singleflight import single_flight, get_lock_path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class SingleFlightTests(SimpleTestCase):
+
+    def setUp(self):
+        self.lock_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.lock_dir.cleanup)
+        settings_override = override_settings(SINGLE_FLIGHT_LOCK_DIR=self.lock_dir.name, SINGLE_FLIGHT_POLL_INTERVAL=0.01)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.store = {}
+        self.compute_calls = 0
+
+
+    def lookup(self):
+        return self.store.get('value')
+
+
+    def slow_compute(self):
+        self.compute_calls += 1
+        time.sleep(0.2)
+        self.store['value'] = 'computed'
+        return 'computed'
+
+
+    def test_concurrent_callers_compute_once(self):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(single_flight('stats', self.slow_compute, self.lookup, timeout=5)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.compute_calls, 1)
+        self.assertEqual(results, ['computed'] * 8)
+
+
+    def test_existing_value_skips_compute(self):
+        self.store['value'] = 'cached'
+
+        self.assertEqual(single_flight('stats', self.slow_compute, self.lookup), 'cached')
+        self.assertEqual(self.compute_calls, 0)
+
+
+    @skipUnless(fcntl, 'Sperrdateien benötigen fcntl')
+    def test_waits_for_lock_held_by_other_process(self):
+        with open(get_lock_path('stats'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            def finish_other_process():
+                time.sleep(0.1)
+                self.store['value'] = 'other process'
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+            other_process = threading.Thread(target=finish_other_process)
+            other_process.start()
+            result = single_flight('stats', self.slow_compute, self.lookup, timeout=5)
+            other_process.join()
+
+        self.assertEqual(result, 'other process')
+        self.assertEqual(self.compute_calls, 0)
+
+
+    @skipUnless(fcntl, 'Sperrdateien benötigen fcntl')
+    def test_computes_after_timeout(self):
+        with open(get_lock_path('stats'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            result = single_flight('stats', self.slow_compute, self.lookup, timeout=0.05)
+
+        self.assertEqual(result, 'computed')
+        self.assertEqual(self.compute_calls, 1)
+
+
+    def test_falls_back_to_process_lock_without_lock_dir(self):
+        with override_settings(SINGLE_FLIGHT_LOCK_DIR='/dev/null/single-flight'):
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(single_flight('stats', self.slow_compute, self.lookup, timeout=5)))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.compute_calls, 1)
+        self.assertEqual(results, ['computed'] * 4)
+
+
+    def test_falls_back_to_process_lock_without_fcntl(self):
+        with mock.patch('coderr_app.api.singleflight.fcntl', None):
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(single_flight('stats', self.slow_compute, self.lookup, timeout=5)))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.compute_calls, 1)
+        self.assertEqual(results, ['computed'] * 4)